@@ -16,17 +16,18 @@
 # You should have received a copy of the GNU General Public License
 # along with GalMag.  If not, see <http://www.gnu.org/licenses/>.
 #
+from functools import lru_cache
+import math
 import numpy as np
 import scipy.integrate
 import scipy.special
 from numpy import linalg as LA
-from joblib import Parallel, delayed
+from numba import njit, prange
 
 from galmag.B_field import B_field_component
 
 from .B_generator import B_generator
 import galmag.disk_profiles as prof
-from galmag.util import get_max_jobs
 
 _default_disk_parameters = {
     'disk_modes_normalization': np.array([1., 1., 1.]),  # Cn_d
@@ -43,6 +44,54 @@ _default_disk_parameters = {
     'disk_newman_boundary_condition_envelope': False
 }
 
+@lru_cache(maxsize=None)
+def _jn_zeros(n, nt):
+    """
+    Cached version of :func:`scipy.special.jn_zeros` (the returned array
+    is read-only, as it is shared between calls)
+    """
+    zeros = scipy.special.jn_zeros(n, nt)
+    zeros.flags.writeable = False
+    return zeros
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _disk_modes_kernel(j0_knr, j1_knr, z, decay, kn, Cn, K0, Ralpha_local,
+                       sqrt_Dlocal, h):
+    """
+    Computes the disk modes with wavenumbers kn and normalizations Cn,
+    at each point of the (flattened) grid, in a single pass, given
+    the Bessel functions J_0(kn r) and J_1(kn r)
+    """
+    pi = math.pi
+    four_pi32 = 4.0*pi**1.5
+
+    n_modes = kn.size
+    n_points = z.size
+    Br = np.empty((n_modes, n_points), z.dtype)
+    Bphi = np.empty((n_modes, n_points), z.dtype)
+    Bz = np.empty((n_modes, n_points), z.dtype)
+    for i in prange(n_points):
+        # Mode independent factors
+        piz_half = (pi/2.)*z[i]
+        sin_piz_half = math.sin(piz_half)
+        cos_piz_half = math.cos(piz_half)
+        K0_i = K0[i]*decay[i]
+
+        Br_i = K0_i*Ralpha_local[i]*(cos_piz_half
+            + 3./four_pi32*sqrt_Dlocal[i]*math.cos(3.*piz_half))
+        Bphi_i = -2.*K0_i*sqrt_Dlocal[i]/math.sqrt(pi)*cos_piz_half
+        Bz_i = -2.*h[i]/pi*K0_i*Ralpha_local[i]*(sin_piz_half
+            + math.sin(3.*piz_half)*sqrt_Dlocal[i]/four_pi32)
+
+        for m in range(n_modes):
+            Br[m,i] = Cn[m]*Br_i*j1_knr[m,i]
+            Bphi[m,i] = Cn[m]*Bphi_i*j1_knr[m,i]
+            Bz[m,i] = kn[m]*Cn[m]*Bz_i*j0_knr[m,i]
+
+    return Br, Bphi, Bz
+
+
 class B_generator_disk(B_generator):
     """
     Generator for the disk field
@@ -58,7 +107,11 @@ class B_generator_disk(B_generator):
         Choice between 'cartesian', 'spherical' and 'cylindrical' *uniform*
         coordinate grids. Default: 'cartesian'
     dtype : numpy.dtype, optional
-        Data type used. Default: np.dtype(float)
+        Data type used (also in the computation of the modes on the grid,
+        e.g. `numpy.float32` halves the memory traffic of the Bessel
+        function evaluations, with a relative error of ~1e-6). The
+        normalizations are always computed in double precision.
+        Default: np.dtype(float)
 
     """
     def __init__(self, grid=None, box=None, resolution=None,
@@ -108,7 +161,7 @@ class B_generator_disk(B_generator):
         """
         parsed_parameters = self._parse_parameters(kwargs)
         self.modes_count = max(len(reversals)+1, number_of_modes)
-        self._bessel_jn_zeros = scipy.special.jn_zeros(1, self.modes_count)
+        self._bessel_jn_zeros = _jn_zeros(1, self.modes_count)
 
         # The calculation is done solving the problem
         # A C = R
@@ -117,40 +170,34 @@ class B_generator_disk(B_generator):
         # and x_j = disk_ref_r_cylindrical for j=modes_count+1
         # R_i = B_phi_ref for j=modes_count+1, otherwise R_i=0
 
-        A = np.empty((len(reversals)+1, self.modes_count))
+        # Positions where Bphi is constrained: the reversals (where it
+        # should be 0) and the reference radius (where it should be B_phi_ref)
+        r_constraints = np.append(np.asarray(reversals, dtype=float),
+                                  parsed_parameters['disk_ref_r_cylindrical'])
+        zeros = np.zeros_like(r_constraints)
+
         tmp_parameters = parsed_parameters.copy()
-        i=-1 # For the case of no-reversals
-
-        for i, r_reversal in enumerate(reversals):
-            r_reversal = float(r_reversal)
-            for j in range(self.modes_count):
-                tmp_parameters['disk_modes_normalization'] = \
-                                                np.zeros(self.modes_count)
-                tmp_parameters['disk_modes_normalization'][j] = 1
-                # Computes Bphi at each reversal (this should be 0)
-                Br, Bphi, Bz = self._convert_coordinates_to_B_values(
-                                                  np.array([r_reversal,]),
-                                                  np.array([0.0,]),
-                                                  np.array([0.0,]),
-                                                  tmp_parameters)
-                A[i,j] = Bphi[0]
-
-        # The system of equations also accounts for the value at the Rsun
-        for j in range(self.modes_count):
-            tmp_parameters['disk_modes_normalization'] = \
-                                                np.zeros(self.modes_count)
-            tmp_parameters['disk_modes_normalization'][j] = 1
-            # Computes Bphi at the reference radius (this should be B_phi_ref)
-            Br, Bphi, Bz = self._convert_coordinates_to_B_values(
-                np.array([parsed_parameters['disk_ref_r_cylindrical'],]),
-                np.array([0.0,]), np.array([0.0,]), tmp_parameters)
-            A[i+1,j] = Bphi[0]
-
-        results = np.zeros(len(reversals)+1)
-        results[i+1] = B_phi_ref
-
-        # Uses a least squares fit to find the solution
-        Cns, residuals, rank, s = LA.lstsq(A, results, rcond=None)
+        tmp_parameters['disk_modes_normalization'] = np.ones(self.modes_count)
+
+        # Computes Bphi of all the (unnormalized) modes at all the
+        # constrained positions at once
+        Br, Bphi, Bz = self._convert_coordinates_to_B_values(
+            r_constraints, zeros, zeros, tmp_parameters, sum_modes=False,
+            dtype=float)
+        A = Bphi.T
+
+        results = np.zeros(len(r_constraints))
+        results[-1] = B_phi_ref
+
+        # Degenerate constraints (e.g. repeated reversals) are seldom
+        # exactly singular numerically, thus the condition number is checked
+        if (A.shape[0] == A.shape[1] and
+                LA.cond(A) < 1./np.finfo(A.dtype).eps):
+            # As many independent constraints as modes: solves directly
+            Cns = LA.solve(A, results)
+        else:
+            # Uses a least squares fit to find the solution
+            Cns, residuals, rank, s = LA.lstsq(A, results, rcond=None)
         parsed_parameters['disk_modes_normalization'] = Cns
 
         return self.get_B_field(**parsed_parameters)
@@ -180,11 +227,11 @@ class B_generator_disk(B_generator):
         if not parsed_parameters['disk_newman_boundary_condition_envelope']:
             # Uses Q(s_d) = 0 as boundary condition, which corresponds to
             # k_n being a root of the J_1 Bessel function
-            self._bessel_jn_zeros = scipy.special.jn_zeros(1, self.modes_count)
+            self._bessel_jn_zeros = _jn_zeros(1, self.modes_count)
         else:
             # Uses d[sQ(s)]/ds = 0 at s_d as boundary condition, which
             # corresponds to k_n being a root of the J_0 Bessel function
-            self._bessel_jn_zeros = scipy.special.jn_zeros(0, self.modes_count)
+            self._bessel_jn_zeros = _jn_zeros(0, self.modes_count)
 
         # local_B_r_cylindrical, local_B_phi, local_B_z
         Br, Bphi, Bz =  self._convert_coordinates_to_B_values(self.grid.r_cylindrical,
@@ -203,7 +250,8 @@ class B_generator_disk(B_generator):
 
     def _convert_coordinates_to_B_values(self, r_cylindrical,
                                          phi, z,
-                                         parameters):
+                                         parameters, sum_modes=True,
+                                         dtype=None):
         """
         Contains the actual calculation of B_disk
 
@@ -211,6 +259,12 @@ class B_generator_disk(B_generator):
         ----------
         r_cylindrical, phi, z : numpy.ndarray
             Arrays containing the coordinates grids
+        sum_modes : bool
+            If False, the contribution of each mode is returned separately,
+            stacked along a new leading axis. Default: True
+        dtype : numpy.dtype, optional
+            Data type used in the computation of the modes. If None,
+            the generator's dtype is used. Default: None
 
         Returns
         -------
@@ -219,7 +273,13 @@ class B_generator_disk(B_generator):
             field in the galactic disc
         """
         # Initializes local variables
-        result_fields =  [np.zeros_like(r_cylindrical, dtype=self.dtype)
+        if dtype is None:
+            dtype = self.dtype
+        if sum_modes:
+            shape = np.shape(r_cylindrical)
+        else:
+            shape = (self.modes_count,) + np.shape(r_cylindrical)
+        result_fields =  [np.zeros(shape, dtype=dtype)
                           for i in range(3)]
 
         # Radial coordinate will be written in units of disk radius
@@ -241,72 +301,47 @@ class B_generator_disk(B_generator):
         # Separates inner and outer parts of the disk solutions
         separator = abs(z_dimensionless) <= 1.0
         # Separator which focuses on the dynamo active region
-        active_separator = abs(r_cylindrical_dimensionless <= 1.0)
-
-        # List of objects required for the computation which includes
-        # the result-arrays and the dimensionless local coordinate grid
-        item_list = result_fields + [
-            r_cylindrical_dimensionless, phi, z_dimensionless]
-
-        inner_objects = [item[separator * active_separator] for item in item_list]
-        outer_objects = [item[~separator * active_separator] for item in item_list]
-
-        mode_normalizations = []
-        for mode_number in range(self.modes_count):
-
-            mode_normalization = \
-                parameters['disk_modes_normalization'][mode_number]
-            if mode_normalization==0:
-                mode_normalizations.append(0)
-                continue
-
-            # Normalizes each mode, making |B_mode| unity at Rsun
-            Br_sun, Bphi_sun, Bz_sun = self._get_B_mode([Rsun/disk_radius,
-                                                              0.0, 0.0],
-                                                              mode_number,
-                                                              1.0,
-                                                              parameters,
-                                                              mode='inner')
-            renormalization = (Br_sun**2 + Bphi_sun**2 + Bz_sun**2)**-0.5
-
-            mode_normalization *= renormalization
-
-            mode_normalizations.append(mode_normalization)
-
-        n_jobs = min(self.modes_count, get_max_jobs())
-
-        # Computes free decay modes in parallel (inner part)
-        inner_fields_list = Parallel(n_jobs=n_jobs)(
-            delayed(self._get_B_mode)(inner_objects[3:], mode_number,
-                                      mode_norm, parameters, mode='inner')
-            for mode_number, mode_norm in enumerate(mode_normalizations))
-
-        # Adds to final solution
-        for fields in inner_fields_list:
-            for i in range(3):
-                inner_objects[i] += fields[i]
-        del inner_fields_list  # Saves memory
-
-        # Computes free decay modes in parallel (outer part)
-        outer_fields_list = Parallel(n_jobs=n_jobs)(
-            delayed(self._get_B_mode)(outer_objects[3:], mode_number,
-                                      mode_norm, parameters, mode='outer')
-            for mode_number, mode_norm in enumerate(mode_normalizations))
-
-        # Adds to final solution
-        for fields in outer_fields_list:
-            for i in range(3):
-                outer_objects[i] += fields[i]
-        del outer_fields_list  # Saves memory
-
-        for i in range(3):
-            result_fields[i][separator * active_separator] += inner_objects[i]
-            result_fields[i][~separator * active_separator] += outer_objects[i]
+        active_separator = r_cylindrical_dimensionless <= 1.0
+
+        inner_region = separator & active_separator
+        outer_region = active_separator & ~separator
+
+        # Dimensionless local coordinate grid
+        coordinates = [r_cylindrical_dimensionless, phi, z_dimensionless]
+
+        # Normalizes each mode, making |B_mode| unity at Rsun
+        # (all the modes are computed at once, stacked along the first axis)
+        Br_sun, Bphi_sun, Bz_sun = self._get_B_mode([Rsun/disk_radius,
+                                                     0.0, 0.0],
+                                                    np.arange(self.modes_count),
+                                                    1.0,
+                                                    parameters,
+                                                    mode='inner')
+        renormalization = (Br_sun**2 + Bphi_sun**2 + Bz_sun**2)**-0.5
+
+        mode_normalizations = np.array(
+            parameters['disk_modes_normalization'], dtype=float)
+        nonzero = mode_normalizations != 0
+        mode_normalizations[nonzero] *= renormalization[nonzero]
+
+        # Computes all the free decay modes at once (inner and outer parts),
+        # writing their sum directly to the final solution
+        for region, mode in ((inner_region, 'inner'),
+                             (outer_region, 'outer')):
+            fields = self._get_B_mode([item[region] for item in coordinates],
+                                      np.arange(self.modes_count),
+                                      mode_normalizations, parameters,
+                                      mode=mode, dtype=dtype)
+            for result, field in zip(result_fields, fields):
+                if sum_modes:
+                    result[region] = field.sum(axis=0)
+                else:
+                    result[:,region] = field
 
         return result_fields
 
     def _get_B_mode(self, grid_arrays, mode_number, mode_normalization,
-                    parameters, mode):
+                    parameters, mode, dtype=float):
         """
         Computes a given disk mode
 
@@ -314,20 +349,25 @@ class B_generator_disk(B_generator):
         ----------
         grid_arrays : array_like
           array containig r_cylindrical, phi and z
-        mode_number : int
-          the index of the requested mode
-        mode_normalization :
-          normalization of the mode
+        mode_number : int or array_like
+          the index of the requested mode. If an array of indices is
+          provided, the modes are computed at once and stacked along a new
+          leading axis
+        mode_normalization : float or array_like
+          normalization of the mode (or of each of the modes)
         parameters : dict
           dictionary containin parameters
         mode : str
           'inner' for computing the field inside the disc height,
           'outer' for it externally
+        dtype : numpy.dtype, optional
+          floating point type used in the computation of the modes.
+          Default: float
 
         Returns
         -------
         list
-            List containing d2o's for Br, Bphi, Bz
+            List containing arrays for Br, Bphi, Bz
         """
 
         # Unpacks some parameters (for convenience)
@@ -344,8 +384,6 @@ class B_generator_disk(B_generator):
         Ralpha = parameters['disk_turbulent_induction']  \
                     * disk_ref_r_cylindrical / disk_radius
 
-        Cn = mode_normalization
-
         r_grid = grid_arrays[0]
         phi_grid = grid_arrays[1]
         pi = np.pi
@@ -382,30 +420,33 @@ class B_generator_disk(B_generator):
         sqrt_Dlocal = np.sqrt(-Dlocal)
         # Normalization correction
         K0 =  (-Dlocal*4./pi -Dlocal*9./pi**3/16 + 1.0)**(-0.5)
-        # Other reoccuring quantities
-        kn = self._bessel_jn_zeros[mode_number]
-        four_pi32 = (4.0*pi**(3./2.))
-        knr = kn*r_grid
-        j0_knr = scipy.special.j0(knr)
-        j1_knr = scipy.special.j1(knr)
-        piz_half = (pi/2.) * z_grid
-        sin_piz_half = np.sin(piz_half)
-        cos_piz_half = np.cos(piz_half)
         Ralpha_local = Omega * Ralpha
 
-        # Computes the magnetic field modes
-        Br = Cn*K0 * Ralpha_local * j1_knr * \
-            (cos_piz_half + 3./four_pi32*sqrt_Dlocal*np.cos(3.*piz_half))
-
-        Bphi = -2.* Cn*K0 * sqrt_Dlocal/np.sqrt(pi) * j1_knr * cos_piz_half
-
-        Bz = -2.* kn*h /pi *Cn*K0 * Ralpha_local * j0_knr  \
-            * (sin_piz_half + np.sin(3*piz_half)*sqrt_Dlocal/four_pi32)
-
         if mode == 'outer' and parameters['disk_field_decay']:
             # Makes the exernal field decay with z^-3
-            Br /= abs(grid_arrays[2])**3
-            Bphi /= abs(grid_arrays[2])**3
-            Bz /= abs(grid_arrays[2])**3
+            decay = abs(grid_arrays[2])**-3
+        else:
+            decay = 1.0
 
-        return Br, Bphi, Bz
+        # Mode dependent quantities
+        kn = np.asarray(self._bessel_jn_zeros[mode_number], dtype=float)
+        Cn = np.broadcast_to(np.asarray(mode_normalization, dtype=float),
+                             kn.shape)
+
+        # Computes the magnetic field modes
+        arrays = np.broadcast_arrays(r_grid, z_grid, decay, K0, Ralpha_local,
+                                     sqrt_Dlocal, h)
+        shape = arrays[0].shape
+        r, z, decay, K0, Ralpha_local, sqrt_Dlocal, h = [
+            np.ascontiguousarray(array, dtype=dtype).ravel()
+            for array in arrays]
+
+        knr = np.outer(kn.astype(dtype), r)
+        fields = _disk_modes_kernel(scipy.special.j0(knr),
+                                    scipy.special.j1(knr), z, decay,
+                                    np.atleast_1d(kn), np.atleast_1d(Cn),
+                                    K0, Ralpha_local, sqrt_Dlocal, h)
+
+        # Restores the shape of the grid (with an extra leading axis, if
+        # several modes were requested)
+        return [field.reshape(kn.shape + shape) for field in fields]
@@ -17,15 +17,12 @@
 #
 # -*- coding: utf-8 -*-
 import numpy as np
-from joblib import Parallel, delayed
 
 from .B_generator import B_generator
 from galmag.B_field import B_field_component
-from galmag.util import simpson
 import galmag.halo_free_decay_modes as halo_free_decay_modes
 from galmag.halo_profiles import simple_V, simple_alpha
 from galmag.galerkin import Galerkin_expansion_coefficients
-from galmag.util import get_max_jobs
 
 
 class B_generator_halo(B_generator):
@@ -42,7 +39,8 @@ class B_generator_halo(B_generator):
         Choice between 'cartesian', 'spherical' and 'cylindrical' *uniform*
         coordinate grids. Default: 'cartesian'
     dtype : numpy.dtype, optional
-        Data type used. Default: np.dtype(float)
+        Data type used (also in the computation of the Galerkin expansion
+        coefficients). Default: np.dtype(float)
 
     """
     def __init__(self, grid=None, box=None, resolution=None,
@@ -90,7 +88,8 @@ class B_generator_halo(B_generator):
 
         if parsed_parameters['halo_manually_specified_coefficients'] is None:
             # Finds the coefficients
-            values, vect = Galerkin_expansion_coefficients(parsed_parameters)
+            values, vect = Galerkin_expansion_coefficients(parsed_parameters,
+                                                           dtype=self.dtype)
 
             # Selects fastest growing mode
             ok = np.argmax(values.real)
@@ -112,9 +111,7 @@ class B_generator_halo(B_generator):
         theta_grid = self.grid.theta
         phi_grid = self.grid.phi
 
-        Bvec = [np.zeros_like(r_sph_grid) for i in range(3)]
-
-        n_jobs = min(len(coefficients), get_max_jobs())
+        Bvec = np.zeros((3,)+r_sph_grid.shape, dtype=self.dtype)
 
         if not (parsed_parameters['halo_growing_mode_only'] and
                 growth_rate<0):
@@ -128,33 +125,26 @@ class B_generator_halo(B_generator):
             halo_radius = parsed_parameters['halo_radius']
             symmetric = parsed_parameters['halo_symmetric_field']
 
-            # Computes the normalization at the reference radius
-            Bsun_p = np.array([0.])
-
-            # Comutes free decay modes in parallel
-            Bmodes = Parallel(n_jobs=n_jobs)(
-                delayed(halo_free_decay_modes.get_mode)(
-                    r_sph_grid/halo_radius, theta_grid, phi_grid, i+1, symmetric)
-                for i, coefficient in  enumerate(coefficients))
+            # Computes free decay modes (on the grid and at the reference
+            # position)
+            Bmodes = halo_free_decay_modes.get_all_modes(
+                r_sph_grid/halo_radius, theta_grid, phi_grid,
+                len(coefficients), symmetric)
+            Brefs = halo_free_decay_modes.get_all_modes(
+                ref_radius/halo_radius, ref_theta, np.array([0.]),
+                len(coefficients), symmetric)
 
-            for i, coefficient in enumerate(coefficients):
-                # Calculates free-decay modes locally
-                Bmode = Bmodes[i]
+            # Sums the modes (the grid may be of a wider type than dtype)
+            Bvec = np.tensordot(coefficients, Bmodes,
+                                axes=1).astype(self.dtype, copy=False)
 
-                for j in range(3):
-                    Bvec[j] += Bmode[j] * coefficient
-
-                Brefs = halo_free_decay_modes.get_mode(
-                    ref_radius/halo_radius, ref_theta, np.array([0.]), i+1,
-                    symmetric)
-
-                Bsun_p += Brefs[2] * coefficient
+            # Computes the normalization at the reference radius
+            Bsun_p = np.dot(coefficients, Brefs[:,2,0])
 
-            Bnorm = parsed_parameters['halo_ref_Bphi']/Bsun_p[0]
+            Bnorm = parsed_parameters['halo_ref_Bphi']/Bsun_p
 
             if not parsed_parameters['halo_do_not_normalize']:
-                for i in range(3):
-                    Bvec[i] *= Bnorm
+                Bvec *= Bnorm
 
         parsed_parameters['halo_field_growth_rate'] = growth_rate
         parsed_parameters['halo_field_coefficients'] = coefficients
@@ -116,10 +116,6 @@ class Grid(object):
         return self.x / self.r_cylindrical
 
     def _generate_coordinates(self):
-        # Initializes all coordinate arrays
-        [x_array, y_array, z_array, r_spherical_array, r_cylindrical_array,
-         theta_array, phi_array] = [self.get_prototype() for i in range(7)]
-
         # The definitions of "local_coordinates" may help if a distributed
         # version is wanted in the future. Version 1.1.0 of GalMag may be used
         # as reference for this.
@@ -130,6 +126,11 @@ class Grid(object):
                        slice(box[2,0], box[2,1], self.resolution[2]*1j))
 
         local_coordinates = np.mgrid[local_slice]
+        # Sparse (open) version of the grid, with each coordinate stored as
+        # a 1-D array with singleton axes: functions of fewer than three
+        # coordinates are computed on these and only then broadcast
+        sparse_coordinates = np.ogrid[local_slice]
+        shape = local_coordinates[0].shape
 
         if self.grid_type=='cartesian':
             # Prepares an uniform cartesian grid
@@ -137,11 +138,12 @@ class Grid(object):
             y_array = local_coordinates[1]
             z_array = local_coordinates[2]
 
-            x2y2 = local_coordinates[0]**2 + local_coordinates[1]**2
-            local_r_spherical = np.sqrt(x2y2 + local_coordinates[2]**2)
-            local_r_cylindrical = np.sqrt(x2y2)
+            x, y, z = sparse_coordinates
+            x2y2 = x**2 + y**2
+            local_r_spherical = np.sqrt(x2y2 + z**2)
+            local_r_cylindrical = np.broadcast_to(np.sqrt(x2y2), shape).copy()
             local_theta = np.arccos(local_coordinates[2]/local_r_spherical)
-            local_phi = np.arctan2(local_coordinates[1], local_coordinates[0])
+            local_phi = np.broadcast_to(np.arctan2(y, x), shape).copy()
 
             r_spherical_array = local_r_spherical
             r_cylindrical_array = local_r_cylindrical
@@ -154,16 +156,17 @@ class Grid(object):
             theta_array = local_coordinates[1]
             phi_array = local_coordinates[2]
 
-            local_sin_theta = np.sin(local_coordinates[1])
-            local_cos_theta = np.cos(local_coordinates[1])
-            local_sin_phi = np.sin(local_coordinates[2])
-            local_cos_phi = np.cos(local_coordinates[2])
-
-            local_x = local_coordinates[0] * local_sin_theta * local_cos_phi
-            local_y = local_coordinates[0] * local_sin_theta * local_sin_phi
-            local_z = local_coordinates[0] * local_cos_theta
+            r, theta, phi = sparse_coordinates
+            local_sin_theta = np.sin(theta)
+            local_cos_theta = np.cos(theta)
+            local_sin_phi = np.sin(phi)
+            local_cos_phi = np.cos(phi)
 
-            local_r_cylindrical = local_coordinates[0] * local_sin_theta
+            local_r_cylindrical = np.broadcast_to(r * local_sin_theta,
+                                                  shape).copy()
+            local_x = local_r_cylindrical * local_cos_phi
+            local_y = local_r_cylindrical * local_sin_phi
+            local_z = np.broadcast_to(r * local_cos_theta, shape).copy()
 
             r_cylindrical_array = local_r_cylindrical
             x_array = local_x
@@ -176,15 +179,18 @@ class Grid(object):
             phi_array = local_coordinates[1]
             z_array = local_coordinates[2]
 
-            local_sin_phi = np.sin(local_coordinates[1])
-            local_cos_phi = np.cos(local_coordinates[1])
+            s, phi, z = sparse_coordinates
+            local_sin_phi = np.sin(phi)
+            local_cos_phi = np.cos(phi)
 
-            local_x = local_coordinates[0] * local_cos_phi
-            local_y = local_coordinates[0] * local_sin_phi
+            local_x = np.broadcast_to(s * local_cos_phi, shape).copy()
+            local_y = np.broadcast_to(s * local_sin_phi, shape).copy()
 
-            local_r_spherical = np.sqrt(local_coordinates[0]**2
-                                        + local_coordinates[2]**2)
-            local_theta = np.arccos(local_coordinates[2]/local_r_spherical)
+            local_r_spherical = np.sqrt(s**2 + z**2)
+            local_theta = np.broadcast_to(np.arccos(z/local_r_spherical),
+                                          shape).copy()
+            local_r_spherical = np.broadcast_to(local_r_spherical,
+                                                shape).copy()
 
             r_spherical_array = local_r_spherical
             theta_array = local_theta
@@ -41,42 +41,12 @@ def plot_r_z_uniform(B,skipr=3,skipz=5, quiver=True, contour=True,
     # Requires a cylindrical grid
     assert B.grid.grid_type == 'cylindrical'
 
-    # Makes a color contour plot
-    if contour:
-        CP = plt.contourf(B.grid.r_cylindrical[:,0,:], B.grid.z[:,0,:],
-                      -B.phi[:,0,:], alpha=0.75, vmin=vmin, vmax=vmax,
-                      levels=levels, cmap=cmap)
-        CB = plt.colorbar(CP, label=r'$B_\phi\,[\mu{{\rm G}}]$',)
-        plt.setp(CP.collections , linewidth=2)
-
-    if quiver:
-        plt.quiver(B.grid.r_cylindrical[::skipr,0,::skipz], B.grid.z[::skipr,0,::skipz],
-                 B.r_cylindrical[::skipr,0,::skipz],B.z[::skipr,0,::skipz],
-                 color=quiver_color, alpha=0.75, **kwargs)
-
-    if field_lines:
-        x = np.array(B.grid.r_cylindrical[:,0,0])
-        y = np.array(B.grid.z[0,0,:])
-        u = -np.array(B.r_cylindrical[:,0,:])
-        v = -np.array(B.z[:,0,:])
-        lw = np.sqrt(((B.r_cylindrical[:,0,:])**2+
-              #(B.phi[:,0,:])**2+
-              (B.z[:,0,:])**2))
-        #lw = np.log10(lw)
-        #lw[lw<0]=0
-        #lw = lw /lw.max()
-        #print lw.shape
-
-        plt.streamplot(x, y, -u.T, -v.T,color='r',
-                       linewidth=lw.T)
-
-    plt.ylim([B.grid.z[:,0,:].min(),
-          B.grid.z[:,0,:].max()])
-    plt.xlim([B.grid.r_cylindrical[:,0,:].min(),
-          B.grid.r_cylindrical[:,0,:].max()])
-
-    plt.xlabel(r'$R\,[{{\rm kpc}}]$')
-    plt.ylabel(r'$z\,[{{\rm kpc}}]$')
+    _plot_axial_slice(B.grid.r_cylindrical[:,0,:], B.grid.z[:,0,:],
+                      B.r_cylindrical[:,0,:], B.z[:,0,:], -B.phi[:,0,:],
+                      skipr, skipz, r'$R\,[{{\rm kpc}}]$',
+                      quiver=quiver, contour=contour, field_lines=field_lines,
+                      quiver_color=quiver_color, cmap=cmap, vmin=vmin,
+                      vmax=vmax, levels=levels, **kwargs)
 
 
 def plot_x_z_uniform(B,skipx=1,skipz=5,iy=0, quiver=True, contour=True,
@@ -105,25 +75,52 @@ def plot_x_z_uniform(B,skipx=1,skipz=5,iy=0, quiver=True, contour=True,
     # Requires a Cartesian grid
     assert B.grid.grid_type == 'cartesian'
 
+    _plot_axial_slice(B.grid.x[:,iy,:], B.grid.z[:,iy,:],
+                      B.x[:,iy,:], B.z[:,iy,:], B.phi[:,iy,:],
+                      skipx, skipz, r'$x\,[{{\rm kpc}}]$',
+                      quiver=quiver, contour=contour, field_lines=False,
+                      quiver_color=quiver_color, cmap=cmap, vmin=vmin,
+                      vmax=vmax, colorbar=not no_colorbar, **kwargs)
+
+
+def _plot_axial_slice(h, v, Bh, Bv, Bphi, skiph, skipv, h_label,
+                      quiver=True, contour=True, field_lines=True,
+                      quiver_color='0.25', cmap='viridis', vmin=None,
+                      vmax=None, levels=None, colorbar=True, **kwargs):
+    """
+    Plots a slice containing the z-axis, given the (2D) horizontal and
+    vertical coordinates (h, v), the field components along them (Bh, Bv)
+    and the azimuthal field (Bphi). Used by :func:`plot_r_z_uniform` and
+    :func:`plot_x_z_uniform`.
+    """
     # Makes a color contour plot
     if contour:
-        CP = plt.contourf(B.grid.x[:,iy,:], B.grid.z[:,iy,:], B.phi[:,iy,:],
-                        alpha=0.75, cmap=cmap, vmin=vmin, vmax=vmax)
-        if not no_colorbar:
+        CP = plt.contourf(h, v, Bphi, alpha=0.75, vmin=vmin, vmax=vmax,
+                          levels=levels, cmap=cmap)
+        if colorbar:
             CB = plt.colorbar(CP, label=r'$B_\phi\,[\mu{{\rm G}}]$',)
-            plt.setp(CP.collections , linewidth=2)
 
     if quiver:
-        plt.quiver(B.grid.x[::skipx,iy,::skipz], B.grid.z[::skipx,iy,::skipz],
-                 B.x[::skipx,iy,::skipz],B.z[::skipx,iy,::skipz],
-                 color=quiver_color, alpha=0.75,**kwargs)
+        plt.quiver(h[::skiph,::skipv], v[::skiph,::skipv],
+                   Bh[::skiph,::skipv], Bv[::skiph,::skipv],
+                   color=quiver_color, alpha=0.75, **kwargs)
 
-    plt.ylim([B.grid.z[:,iy,:].min(),
-          B.grid.z[:,iy,:].max()])
-    plt.xlim([B.grid.x[:,iy,:].min(),
-          B.grid.x[:,iy,:].max()])
+    if field_lines:
+        lw = np.sqrt(Bh**2+
+              #Bphi**2+
+              Bv**2)
+        #lw = np.log10(lw)
+        #lw[lw<0]=0
+        #lw = lw /lw.max()
+        #print lw.shape
 
-    plt.xlabel(r'$x\,[{{\rm kpc}}]$')
+        plt.streamplot(h[:,0], v[0,:], Bh.T, Bv.T, color='r',
+                       linewidth=lw.T)
+
+    plt.ylim([v.min(), v.max()])
+    plt.xlim([h.min(), h.max()])
+
+    plt.xlabel(h_label)
     plt.ylabel(r'$z\,[{{\rm kpc}}]$')
 
 
@@ -153,21 +150,24 @@ def plot_y_z_uniform(B, skipy=5, skipz=5, ix=0, quiver=True, contour=True,
     # Requires a Cartesian grid
     assert B.grid.grid_type == 'cartesian'
 
+    # Slices the mesh only once
+    y = B.grid.y[ix,:,:]
+    z = B.grid.z[ix,:,:]
+
     # Makes a color contour plot
-    CP = plt.contourf(B.grid.y[ix,:,:], B.grid.z[ix,:,:], B.phi[ix,:,:],
+    CP = plt.contourf(y, z, B.phi[ix,:,:],
                     alpha=0.75, cmap=cmap, vmin=vmin, vmax=vmax)
     CB = plt.colorbar(CP, label=r'$B_\phi\,[\mu{{\rm G}}]$',)
-    plt.setp(CP.collections , linewidth=2)
 
     if quiver:
-        plt.quiver(B.grid.y[ix,::skipy,::skipz], B.grid.z[ix,::skipy,::skipz],
+        plt.quiver(y[::skipy,::skipz], z[::skipy,::skipz],
                  B.y[ix,::skipy,::skipz],B.z[ix,::skipy,::skipz],
                  color=quiver_color, alpha=0.75,**kwargs)
 
-    plt.ylim([B.grid.z[ix,:,:].min(),
-          B.grid.z[ix,:,:].max()])
-    plt.xlim([B.grid.y[ix,:,:].min(),
-          B.grid.y[ix,:,:].max()])
+    ymin, ymax = y.min(), y.max()
+    zmin, zmax = z.min(), z.max()
+    plt.ylim([zmin, zmax])
+    plt.xlim([ymin, ymax])
 
     plt.xlabel(r'$y\,[{{\rm kpc}}]$')
     plt.ylabel(r'$z\,[{{\rm kpc}}]$')
@@ -202,28 +202,35 @@ def plot_x_y_uniform(B, skipx=5, skipy=5, iz=0, field_lines=True, quiver=True,
     # Requires a Cartesian grid
     assert B.grid.grid_type == 'cartesian'
 
+    # Slices the mesh only once
+    x = B.grid.x[:,:,iz]
+    y = B.grid.y[:,:,iz]
+
     if contour:
-        CP = plt.contourf(B.grid.x[:,:,iz], B.grid.y[:,:,iz],
-                          np.sqrt(B.x[:,:,iz]**2+B.y[:,:,iz]**2+B.z[:,:,iz]**2),
+        # Field strength on the slice
+        Bmag = np.hypot(np.hypot(B.x[:,:,iz], B.y[:,:,iz]), B.z[:,:,iz])
+        CP = plt.contourf(x, y, Bmag,
                           alpha=0.75, cmap=cmap, vmax=vmax, vmin=vmin,
                           levels=levels)
         CB = plt.colorbar(CP, label=r'$B\,[\mu{{\rm G}}]$',)
-        plt.setp(CP.collections , linewidth=2)
 
     if field_lines:
-        plt.streamplot(np.array(B.grid.x[:,0,iz]), np.array(B.grid.y[0,:,iz]),
-                    -np.array(B.y[:,:,iz]), -np.array(B.x[:,:,iz]),color='r')
+        # (the negation already produces new arrays, no further copies needed)
+        plt.streamplot(x[:,0], y[0,:], -B.y[:,:,iz], -B.x[:,:,iz], color='r')
     if quiver:
 
         Bx, By = B.x[::skipx,::skipy,iz],B.y[::skipx,::skipy,iz]
-        Bx[Bx==0] = np.nan
-        By[By==0] = np.nan
-        plt.quiver(B.grid.x[::skipx,::skipy,iz], B.grid.y[::skipx,::skipy,iz],
+        # Hides null vectors (without writing NaNs into the field itself)
+        Bx = np.where(Bx==0, np.nan, Bx)
+        By = np.where(By==0, np.nan, By)
+        plt.quiver(x[::skipx,::skipy], y[::skipx,::skipy],
               Bx, By,
               color=quiver_color,**kwargs)
 
-    plt.ylim([B.grid.y[:,:,iz].min(),B.grid.y[:,:,iz].max()])
-    plt.xlim([B.grid.x[:,:,iz].min(),B.grid.x[:,:,iz].max()])
+    xmin, xmax = x.min(), x.max()
+    ymin, ymax = y.min(), y.max()
+    plt.ylim([ymin, ymax])
+    plt.xlim([xmin, xmax])
     plt.xlabel(r'$x\,[{{\rm kpc}}]$')
     plt.ylabel(r'$y\,[{{\rm kpc}}]$')
 
@@ -155,6 +155,19 @@ ranges_Clemens = {
       'C': [0.45,1.60],
       'D': [1.60,1000]
       }
+# Ranges of the fit, in increasing order of R
+_keys_Clemens = ('A', 'B', 'C', 'D')
+# Edges of the ranges above (in the same order as _keys_Clemens)
+_edges_Clemens = np.array([ranges_Clemens[x][0] for x in _keys_Clemens]
+                          + [ranges_Clemens[_keys_Clemens[-1]][1]])
+
+def _Clemens_segments(R, R_d, Rsun):
+    """
+    Index of the range of the Clemens (1985) fit containing each R
+    (i.e. the position of its key in _keys_Clemens; points outside all the
+    ranges get -1 or len(_keys_Clemens))
+    """
+    return np.searchsorted(_edges_Clemens, R*R_d/Rsun, side='right') - 1
 
 def Clemens_Milky_Way_rotation_curve(R, R_d=1.0, Rsun=8.5, normalize=True):
     """
@@ -188,15 +201,15 @@ def Clemens_Milky_Way_rotation_curve(R, R_d=1.0, Rsun=8.5, normalize=True):
         scalar = False
     V = R.copy()
 
-    for x in coef_Clemens:
+    # Finds the relevant range for all points at once
+    segments = _Clemens_segments(R, R_d, Rsun)
+
+    for i, x in enumerate(_keys_Clemens):
         # Construct polynomials
         pol_V = np.poly1d(coef_Clemens[x])
-        # Reads the ranges
-        min_r, max_r = ranges_Clemens[x]
         # Sets the index (selects the relevant range)
-        idx  = R*R_d/Rsun >= min_r
-        idx *= R*R_d/Rsun < max_r
-        # Computes the shear rate ( rdOmega/dr = dV/dr - V/r )
+        idx = segments == i
+        # Computes the rotation curve
         V[idx] = pol_V(R[idx]*R_d)
 
     if normalize:
@@ -243,18 +256,19 @@ def Clemens_Milky_Way_shear_rate(R, R_d=1.0, Rsun=8.5, normalize=True):
         scalar = False
     S = R.copy()
 
-    for x in coef_Clemens:
+    # Finds the relevant range for all points at once
+    segments = _Clemens_segments(R, R_d, Rsun)
+
+    for i, x in enumerate(_keys_Clemens):
         # Construct polynomials
         pol_V = np.poly1d(coef_Clemens[x])
         dVdr = pol_V.deriv()
 
-        # Reads the ranges
-        min_r, max_r = ranges_Clemens[x]
         # Sets the index (selects the relevant range)
-        idx  = R*R_d/Rsun >= min_r
-        idx *= R*R_d/Rsun < max_r
+        idx = segments == i
+        R_idx = R[idx]*R_d
         # Computes the shear rate ( rdOmega/dr = dV/dr - V/r )
-        S[idx] = dVdr(R[idx]*R_d) - pol_V(R[idx]*R_d)/(R[idx]*R_d)
+        S[idx] = dVdr(R_idx) - pol_V(R_idx)/R_idx
 
     if normalize:
         # Normalizes at solar radius
@@ -345,10 +359,8 @@ def regularize(r, Om, S, r_reg, Om_reg, k=4):
         How sharp is the cutoff. Default: 4
 
     """
-    # Sets up exponential cutoff function
-    f = lambda x: np.exp(-(x/r_reg)**-k)
-    # Applies it in a d2o-compatible manner
-    exp_cut = distribute_function(f, r)
+    # Exponential cutoff function
+    exp_cut = np.exp(-(r/r_reg)**-k)
 
     Om_new = exp_cut*(Om-Om_reg) + Om_reg
 
@@ -65,18 +65,14 @@ def constant_ne(rho, theta, phi, ne0=1.0):
     """
     Dummy for constant cosmic ray electron density
     """
-    ne = np.empty_like(rho)
-    ne[:,:,:] = ne0
-    return ne
+    return np.full_like(rho, ne0)
 
 
 def constant_ncr(rho, theta, phi, ncr0=1.0):
     """
     Dummy for constant cosmic ray electron density
     """
-    ncr = np.empty_like(rho)
-    ncr[:,:,:] = ncr0
-    return ncr
+    return np.full_like(rho, ncr0)
 
 
 
@@ -22,10 +22,8 @@ equation.
 """
 import numpy as np
 import galmag.halo_free_decay_modes as halo_free_decay_modes
-from galmag.util import get_max_jobs
 from .Grid import Grid
-from .util import curl_spherical, simpson
-from joblib import Parallel, delayed
+from .util import curl_spherical, curl_phi_spherical, simpson_weights
 
 def Galerkin_expansion_coefficients(parameters, return_matrix=False,
                                     dtype=float):
@@ -53,6 +51,11 @@ def Galerkin_expansion_coefficients(parameters, return_matrix=False,
     ----------
     return_matrix : bool, optional
         If True, the matrix :math:`W_{ij}` will be returned as well.
+    dtype : numpy.dtype, optional
+        Data type used in the computation of the modes and of the integrals.
+        Using `numpy.float32` halves the memory used by the (r, theta) arrays,
+        with a relative error of ~1e-6 in :math:`W_{ij}`. The eigenvalue
+        problem is always solved in double precision. Default: float
     p : dict
         A dictionary of parameters dictionary of parameters containing the parameters:
             - halo_Galerkin_ngrid -> Number of grid points used in the
@@ -71,6 +74,28 @@ def Galerkin_expansion_coefficients(parameters, return_matrix=False,
                                                    rotation curve
             - halo_rotation_characteristic_height -> characteristic z used in some
                                                    rotation curve prescriptions
+            - halo_compute_only_one_quadrant -> if True, exploits the
+                                              equatorial symmetry of the
+                                              solution, provided alpha is
+                                              odd and V is even with
+                                              respect to the midplane
+                                              (see note below)
+
+    Note
+    ----
+    For purely symmetric or antisymmetric fields, and for an alpha profile
+    which is odd and a rotation curve which is even with respect to the
+    midplane (i.e. :math:`\alpha(\pi-\theta)=-\alpha(\theta)`,
+    :math:`V_r` and :math:`V_\phi` even and :math:`V_\theta` odd), both
+    :math:`B_i` and :math:`\hat{W} B_j` have the same parity with respect to
+    the midplane (:math:`B_r` and :math:`B_\phi` even/odd and
+    :math:`B_\theta` odd/even, for symmetric/antisymmetric modes), thus the
+    integrand of :math:`W_{ij}` is always even. If
+    `halo_compute_only_one_quadrant` is set, the integral is computed over
+    the northern hemisphere only (with half the number of points in
+    :math:`\theta`) and multiplied by two. The parities of the alpha
+    profile and rotation curve are checked first: if they do not hold,
+    the integral is computed over the whole sphere instead.
 
 
     Returns
@@ -92,23 +117,41 @@ def Galerkin_expansion_coefficients(parameters, return_matrix=False,
     nmodes = parameters['halo_n_free_decay_modes']
     symmetric = parameters['halo_symmetric_field']
 
+    V_kwargs = dict(fraction=s_v/parameters['halo_radius'],
+                    fraction_z=z_v/parameters['halo_radius'])
+
+    # The polar axis is excluded by the same (small) amount at both poles,
+    # so that the domain is symmetric with respect to the midplane
+    theta_min = 1e-4
+
+    # Checks whether the integrand is symmetric with respect to the midplane
+    one_quadrant = (parameters.get('halo_compute_only_one_quadrant', False)
+                    and symmetric in (True, False)
+                    and _has_midplane_parity(function_alpha, function_V,
+                                             nGalerkin, theta_min,
+                                             **V_kwargs))
+    if one_quadrant:
+        # (an odd number of points is used, as required by Simpson's rule)
+        theta_max, ntheta, hemispheres = np.pi/2., 2*(nGalerkin//4)+1, 2.0
+    else:
+        theta_max, ntheta, hemispheres = np.pi-theta_min, nGalerkin, 1.0
+
     # Prepares a spherical grid for the Galerkin expansion
     galerkin_grid = Grid(box=[[0.00001,1.0], # r range
-                          [0.01,np.pi],  # theta range
+                          [theta_min,theta_max],  # theta range
                           [0.0,0.0]], # phi range
-                          resolution=[nGalerkin,nGalerkin,1],
+                          resolution=[nGalerkin,ntheta,1],
                           grid_type='spherical')
 
-    r_sph_grid = galerkin_grid.r_spherical
-    phi_grid = galerkin_grid.phi
-    theta_grid = galerkin_grid.theta
-
-    n_jobs = min(nmodes, get_max_jobs())
+    r_sph_grid = galerkin_grid.r_spherical.astype(dtype, copy=False)
+    phi_grid = galerkin_grid.phi.astype(dtype, copy=False)
+    theta_grid = galerkin_grid.theta.astype(dtype, copy=False)
 
-    Bmodes = Parallel(n_jobs=n_jobs)(
-      delayed(halo_free_decay_modes.get_mode)(r_sph_grid, theta_grid,
-                                              phi_grid, imode, symmetric)
-      for imode in range(1,nmodes+1))
+    # The spherical grid is separable: passes only the r and theta axes, so
+    # that radial and angular parts of the modes are computed once per axis
+    Bmodes = halo_free_decay_modes.get_all_modes(r_sph_grid[:,:1,:],
+                                                 theta_grid[:1,:,:],
+                                                 phi_grid, nmodes, symmetric)
 
     # Computes alpha
     alpha = function_alpha(r_sph_grid,
@@ -118,24 +161,20 @@ def Galerkin_expansion_coefficients(parameters, return_matrix=False,
     Vs = function_V(r_sph_grid,
                     theta_grid,
                     phi_grid,
-                    fraction=s_v/parameters['halo_radius'],
-                    fraction_z=z_v/parameters['halo_radius'])
+                    **V_kwargs)
 
     # Applies the perturbation operator
-    WBmodes = Parallel(n_jobs=n_jobs)(
-      delayed(perturbation_operator)(r_sph_grid, theta_grid, phi_grid,
-                                     Bmode[0], Bmode[1], Bmode[2],
-                                     Vs[0], Vs[1], Vs[2], alpha,
-                                     Ralpha, Romega,
-                                     parameters['halo_dynamo_type'])
-      for Bmode in Bmodes)
-
-    # This performs better not in parallel in the tests
-    # Wij_list = Parallel(n_jobs=n_jobs)(
-    #     delayed(_compute_Wij)(r_sph_grid, theta_grid, Bmodes[i], WBmodes[j])
-    #     for i in range(nmodes) for j in range(nmodes) if i != j)
-    Wij_list = [_compute_Wij(r_sph_grid, theta_grid, Bmodes[i], WBmodes[j])
-                for i in range(nmodes) for j in range(nmodes) if i != j]
+    WBmodes = np.array([perturbation_operator(r_sph_grid, theta_grid,
+                                              phi_grid,
+                                              Bmode[0], Bmode[1], Bmode[2],
+                                              Vs[0], Vs[1], Vs[2], alpha,
+                                              Ralpha, Romega,
+                                              parameters['halo_dynamo_type'])
+                        for Bmode in Bmodes])
+
+    # Computes the off-diagonal elements
+    Wij = _compute_Wij(r_sph_grid, theta_grid, Bmodes, WBmodes)*hemispheres
+    Wij = Wij.astype(float)
 
     # Overwrites the diagonal with its correct (gamma) values
     if symmetric == True:
@@ -147,16 +186,8 @@ def Galerkin_expansion_coefficients(parameters, return_matrix=False,
     else:
         raise ValueError
 
-    # (re)constructs the Wij array
-    Wij = np.zeros((nmodes,nmodes))
-    k = 0
     for i in range(nmodes):
-        for j in range(nmodes):
-            if i==j:
-                Wij[i,i] = gamma[i]
-            else:
-                Wij[i,j] = Wij_list[k]
-                k+=1
+        Wij[i,i] = gamma[i]
 
     # Solves the eigenvector problem and returns the result
     val, vec = np.linalg.eig(Wij)
@@ -166,23 +197,57 @@ def Galerkin_expansion_coefficients(parameters, return_matrix=False,
         return val, vec, Wij
 
 
-def _compute_Wij(r_sph_grid, theta_grid, Bmodes_i, WBmodes_j):
+def _has_midplane_parity(function_alpha, function_V, ngrid, theta_min,
+                         **V_kwargs):
+    """
+    Checks whether the alpha profile is odd and the rotation curve is
+    even with respect to the midplane, comparing their values in the
+    northern hemisphere with their mirror images (in the Galerkin grid).
+    """
+    r = np.linspace(0.00001, 1.0, ngrid)[:,np.newaxis,np.newaxis]
+    theta = np.linspace(theta_min, np.pi/2.,
+                        2*(ngrid//4)+1)[np.newaxis,:,np.newaxis]
+    phi = np.zeros((1,1,1))
 
-    integrand = np.zeros_like(r_sph_grid)
+    alpha = function_alpha(r, theta, phi)
+    alpha_mirror = function_alpha(r, np.pi-theta, phi)
+    if not np.allclose(alpha_mirror, -alpha):
+        return False
 
-    for k in range(3):
-        integrand += Bmodes_i[k]*WBmodes_j[k]
+    V = function_V(r, theta, phi, **V_kwargs)
+    V_mirror = function_V(r, np.pi-theta, phi, **V_kwargs)
+    for Vi, Vi_mirror, parity in zip(V, V_mirror, (1, -1, 1)):
+        if not np.allclose(Vi_mirror, parity*Vi):
+            return False
+    return True
 
-    integrand *= r_sph_grid**2 * np.sin(theta_grid)
 
-    # Integrates over phi assuming axisymmetry
-    integrand = integrand[:,:,0]*2.0*np.pi
+def _compute_Wij(r_sph_grid, theta_grid, Bmodes, WBmodes):
+    r"""
+    Computes the off-diagonal elements of
+    :math:`W_{ij} = \int B_i \cdot \hat{W} B_j\,dV`, assuming axisymmetry
+    (the diagonal is also computed, but is later overwritten by the caller).
 
-    # Integrates over theta
-    integrand = simpson(integrand, theta_grid[:,:,0])
+    The Simpson quadrature is separable, thus it is expressed as a
+    single array of weights, :math:`w_m`, over the (flattened) (r, theta)
+    plane, and the whole matrix is obtained from a single contraction
 
-    # Integrates over r
-    return simpson(integrand, r_sph_grid[:, 0, 0])
+    .. math::
+        W_{ij} = \sum_{k,m} B_{i,k,m} (\hat{W} B)_{j,k,m} w_m
+    """
+    r = r_sph_grid[:,0,0]
+    theta = theta_grid[0,:,0]
+
+    # Quadrature weights, including the volume element and the integration
+    # over phi
+    weights = np.outer(simpson_weights(r)*r**2,
+                       simpson_weights(theta)*np.sin(theta)) * 2.0*np.pi
+
+    nmodes = len(Bmodes)
+    B = np.asarray(Bmodes).reshape(nmodes, 3, -1)
+    WB = np.asarray(WBmodes).reshape(nmodes, 3, -1)
+
+    return np.einsum('ikm,jkm,m->ij', B, WB, weights.ravel(), optimize=True)
 
 
 def perturbation_operator(r, theta, phi, Br, Bt, Bp, Vr, Vt, Vp,
@@ -192,39 +257,44 @@ def perturbation_operator(r, theta, phi, Br, Bt, Bp, Vr, Vt, Vp,
     to a magnetic field in uniform spherical coordinates.
 
     Parameters
-    --------
-    r/B/alpha/V : array
-        position vector (not radius!), magnetic field, alpha and rotation
-        curve, respectively, expressed as 3xNxNxN arrays containing the
-        :math:`r`, :math:`\theta` and :math:`\phi` components in [0,...], [1,...]
-        and [2,...], respectively.
-    p : dict
-        A dictionary of parameters containing 'Ralpha_h'.
+    ----------
+    r, theta, phi : array
+        NxNxN arrays containing the spherical coordinates.
+    Br, Bt, Bp : array
+        NxNxN arrays containing the :math:`r`, :math:`\theta` and
+        :math:`\phi` components of the magnetic field.
+    Vr, Vt, Vp : array
+        NxNxN arrays containing the components of the rotation curve.
+    alpha : array
+        NxNxN array containing the alpha effect.
+    Ra, Ro : float
+        :math:`R_{\alpha}` and :math:`R_{\omega}`
+    dynamo_type : str
+        Either 'alpha-omega' (in which case the alpha effect is neglected in
+        the azimuthal component) or 'alpha2-omega'. Default: 'alpha-omega'
 
     Returns
     -------
-    list
-        A list containing NxNxN arrays corresponding to the 3 components of
+    numpy.ndarray
+        3xNxNxN array containing the 3 components of
         :math:`\hat W(\mathbf{B})`
     """
-    # Computes \nabla \times (\alpha B)
-    curl_aB = curl_spherical(r, theta, phi, Br*alpha, Bt*alpha, Bp*alpha)
+    if dynamo_type not in ('alpha-omega', 'alpha2-omega'):
+        raise AssertionError('Invalid option: dynamo_type={0}'.format(dynamo_type))
+
+    # Computes R_\alpha \alpha B + R_\omega V \times B
+    # (the curl is linear, thus both terms are combined before taking it)
+    aBr, aBt, aBp = Br*alpha, Bt*alpha, Bp*alpha
 
-    # Computes \nabla \times (V \times B)
-    VcrossBr = (Vt*Bp - Vp*Bt)
-    VcrossBt = (Vp*Br - Vr*Bp)
-    VcrossBp = (Vr*Bt - Vt*Br)
+    Er = Ra*aBr + Ro*(Vt*Bp - Vp*Bt)
+    Et = Ra*aBt + Ro*(Vp*Br - Vr*Bp)
+    Ep = Ra*aBp + Ro*(Vr*Bt - Vt*Br)
 
-    curl_VcrossB = curl_spherical(r, theta, phi,
-                                  VcrossBr, VcrossBt, VcrossBp)
+    WB = np.array(curl_spherical(r, theta, phi, Er, Et, Ep))
 
     if dynamo_type == 'alpha-omega':
-        WBs = [Ra*(curl_aB[i] - curl_aB[2]) + Ro*curl_VcrossB[i]
-               for i in range(3)]
-    elif dynamo_type == 'alpha2-omega':
-        WBs = [Ra*curl_aB[i] + Ro*curl_VcrossB[i]
-               for i in range(3)]
-    else:
-        raise AssertionError('Invalid option: dynamo_type={0}'.format(dynamo_type))
+        # Removes the alpha effect from the azimuthal component
+        WB[2] -= Ra*curl_phi_spherical(r, theta, aBr, aBt)
+
+    return WB
 
-    return WBs
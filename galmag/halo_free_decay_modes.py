@@ -21,10 +21,9 @@ of the halo of a galaxy.
 
 They should be accessed through the function :func:`get_mode`.
 """
-from scipy.special import j0, j1, jv, jn_zeros
 import numpy as np
-from sympy import besselj
-from mpmath import mp, findroot
+import math
+from numba import njit, prange
 import os.path
 
 pi = np.pi
@@ -33,7 +32,174 @@ tan = np.tan
 sin = np.sin
 sqrt = np.sqrt
 
-def get_B_a_1(r, theta, phi, C=0.346, k=pi):
+@njit(cache=True)
+def _sph_jn_series(l, y):
+    """Power series of the spherical Bessel function j_l(y), for small y"""
+    term = 1.0
+    series = 1.0
+    for m in range(1, 10):
+        term *= -0.5*y*y/(m*(2*l + 2*m + 1))
+        series += term
+    double_factorial = 1.0
+    for j in range(3, 2*l + 2, 2):
+        double_factorial *= j
+    return series * y**l / double_factorial
+
+
+@njit(cache=True)
+def _sph_jn_pair(n, y):
+    r"""
+    Computes the spherical Bessel functions :math:`j_{n-1}(y)` and
+    :math:`j_n(y)` for a scalar :math:`y`, without calling
+    :func:`scipy.special.jv` or :func:`scipy.special.spherical_jn`.
+
+    These are obtained by upwards recurrence from
+    :math:`j_0(y)=\sin(y)/y` and :math:`j_1(y)=\sin(y)/y^2-\cos(y)/y`
+    (i.e. their closed forms). Close to the origin these suffer from
+    cancellation errors, thus, for :math:`y<1` a power series is used instead.
+
+    Parameters
+    ----------
+    n : int
+        Order of the spherical Bessel function (n>=1).
+    y : float
+        Argument of the Bessel functions.
+
+    Returns
+    -------
+    tuple
+        :math:`j_{n-1}(y)` and :math:`j_n(y)`
+    """
+    if y < 1.:
+        j_prev = _sph_jn_series(n-1, y)
+        j_curr = _sph_jn_series(n, y)
+    else:
+        siny = math.sin(y)
+        cosy = math.cos(y)
+        inv_y = 1.0/y
+        j_prev = siny*inv_y
+        j_curr = (siny*inv_y - cosy)*inv_y
+        for l in range(1, n):
+            j_next = (2*l + 1)*inv_y*j_curr - j_prev
+            j_prev = j_curr
+            j_curr = j_next
+    return j_prev, j_curr
+
+
+def _boundary_values(n, k):
+    r"""
+    Computes :math:`J_{n-1/2}(k)` and :math:`J_{n+1/2}(k)`, which set the
+    amplitude of the radial profiles outside the unit sphere
+    """
+    # Uses the pure Python version of the function, as this is called at
+    # import time (the kernels are only compiled when first needed)
+    j_km, j_k = _sph_jn_pair.py_func(n, k)
+    norm = math.sqrt(2.0*k/pi)
+    return norm*j_km, norm*j_k
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _radial_profiles_kernel(r, n, k, J_km, J_k):
+    # r^{-1/2} J_{n+1/2}(kr) = sqrt(2k/pi) j_n(kr)
+    norm = math.sqrt(2.0*k/pi)
+
+    Q = np.empty_like(r)
+    X = np.empty_like(r)
+    Q_nm = np.empty_like(r)
+    for i in prange(r.size):
+        ri = r[i]
+        if ri <= 1.:
+            y = k*ri
+            j_nm, j_n = _sph_jn_pair(n, y)
+            Q[i] = norm*j_n
+            X[i] = norm*(y*j_nm - n*j_n)
+            Q_nm[i] = norm*j_nm
+        else:
+            inv_r = 1.0/ri
+            inv_rn = inv_r**n
+            Q_nm[i] = inv_rn*J_km
+            Q[i] = inv_rn*inv_r*J_k
+            X[i] = -n*Q[i]
+    return Q, X, Q_nm
+
+
+def _radial_profiles(r, n, k):
+    r"""
+    Computes the radial profile of a free decay mode,
+
+    .. math::
+        Q(r) = r^{-1/2} J_{n+1/2}(kr) \text{ for } r\leq 1, \quad
+        Q(r) = r^{-(n+1)} J_{n+1/2}(k) \text{ for } r>1
+
+    together with :math:`X = d(rQ)/dr`, which is obtained using
+
+    .. math::
+        \frac{d}{dr}\left[r^{1/2} J_{n+1/2}(kr)\right] =
+        r^{-1/2}\left[y J_{n-1/2}(y) - n J_{n+1/2}(y)\right]
+
+    with :math:`y=kr`. In practice, these are computed from the spherical
+    Bessel functions, using :math:`r^{-1/2}J_{n+1/2}(kr)=\sqrt{2k/\pi}\,j_n(kr)`,
+    which avoids dividing by :math:`\sqrt{r}` and :math:`\sqrt{y}`.
+    Since :math:`J_{n-1/2}` is also needed for this, the
+    profile of order :math:`n-1`, :math:`Q_{n-1}`, is returned as well (this
+    is used by the toroidal mode of each degenerate pair). The work is done
+    by a numba kernel, which computes all quantities in a single pass over
+    the grid. For the modes in this module, the values at the boundary,
+    :math:`J_{n\pm 1/2}(k)`, are taken from the table `_BOUNDARY`, computed
+    at import time.
+
+    Parameters
+    ----------
+    r : array_like
+        Array containing the spherical radial coordinate.
+    n : int
+        Order of the associated spherical Bessel function.
+    k : float
+        :math:`k`
+
+    Returns
+    -------
+    Q, X, Q_nm : numpy.ndarray
+        Arrays with the same shape as `r`.
+    """
+    r = _clamp_radius(r)
+    if (n, k) in _BOUNDARY:
+        J_km, J_k = _BOUNDARY[n, k]
+    else:
+        J_km, J_k = _boundary_values(n, k)
+    # Restricts the kernel to single or double precision grids (avoiding
+    # compiling further specializations)
+    dtype = np.float32 if r.dtype == np.float32 else np.float64
+    profiles = _radial_profiles_kernel(
+        np.ascontiguousarray(r, dtype=dtype).ravel(), n, float(k),
+        float(J_km), float(J_k))
+    return tuple(profile.reshape(r.shape) for profile in profiles)
+
+
+def _clamp_radius(r):
+    r"""
+    Replaces :math:`r` by a tiny positive number wherever :math:`r=0`.
+
+    The modes are regular at the origin, but the expressions for the poloidal
+    components involve :math:`Q/r` and :math:`X/r`. With the clamp these
+    evaluate to their limits (exactly zero for :math:`n>1`), instead of NaN.
+    The value :math:`\sqrt{\text{tiny}}` is used so that the leading term of
+    :math:`Q \propto r^n` does not underflow for :math:`n=1`.
+    """
+    r = np.asarray(r)
+    return np.maximum(r, sqrt(np.finfo(np.result_type(r, np.float32)).tiny))
+
+
+def _as_arrays(B, r, theta):
+    """Converts any 0.0 component of a mode into an array of zeros"""
+    shape = np.broadcast(r, theta).shape
+    dtype = np.result_type(r, theta)
+    return [np.zeros(shape, dtype=dtype) if np.isscalar(Bi) else Bi
+            for Bi in B]
+
+
+def get_B_a_1(r, theta, phi, C=0.346, k=pi,
+              radial_profiles=None):
     r"""
     Computes the first (pure poloidal) antisymmetric free decay mode.
     Purely poloidal.
@@ -50,37 +216,37 @@ def get_B_a_1(r, theta, phi, C=0.346, k=pi):
         Mode normalization.
     k : float, optional
         :math:`k`
+    radial_profiles : tuple, optional
+        Precomputed output of :func:`_radial_profiles` (used by
+        :func:`get_all_modes` to share it between modes).
 
     Returns
     -------
     list
         List containing three `numpy` arrays corresponding to:
         :math:`B_r`, :math:`B_\theta`, :math:`B_\phi`
+        (components which vanish identically are returned as the float 0.0)
     """
-    # Computes radial component
-    Q = np.empty_like(r)
-    separator = r <=1
-    Q[separator] = r[separator]**(-0.5)*jv(3.0/2.0,k*r[separator])
-    Q[~separator] = r[~separator]**(-2.0)*jv(3.0/2.0,k)
+    r = _clamp_radius(r)
+    if radial_profiles is None:
+        radial_profiles = _radial_profiles(r, 1, k)
+    Q, X = radial_profiles[:2]
+    inv_r = 1.0/r
 
-    Br = C*(2.0/r)*Q*cos(theta)
+    # Computes radial component
+    Br = 2.0*C*inv_r*Q*cos(theta)
 
     # Computes polar component
     # X = d(rQ1)/dr
-    X = np.empty_like(r)
-    y = k*r[separator]
-    X[separator] = sqrt(2.0/pi)*(y**2*sin(y) - sin(y) +
-                                 y*cos(y)) / (k**(-0.5)*y**2)
-    X[~separator] = -1.*r[~separator]**(-2.0)*jv(3.0/2.0,k)
-
-    Btheta = C*(-sin(theta)/r)*X
+    Btheta = -C*inv_r*X*sin(theta)
 
     # Sets azimuthal component
-    Bphi   = np.zeros_like(r)
+    Bphi   = 0.0
 
     return Br, Btheta, Bphi
 
-def get_B_a_2(r, theta, phi, C=0.250, k=5.763):
+def get_B_a_2(r, theta, phi, C=0.250, k=5.763,
+              radial_profiles=None):
     r"""
     Computes the second antisymmetric free decay mode - one of a
     degenerate pair, with eigenvalue :math:`\gamma_2=-(5.763)^2`.
@@ -98,43 +264,42 @@ def get_B_a_2(r, theta, phi, C=0.250, k=5.763):
         Mode normalization.
     k : float, optional
         :math:`k`
+    radial_profiles : tuple, optional
+        Precomputed output of :func:`_radial_profiles` (used by
+        :func:`get_all_modes` to share it between modes).
 
     Returns
     -------
     list
         List containing three `numpy` arrays corresponding to:
         :math:`B_r`, :math:`B_\theta`, :math:`B_\phi`
+        (components which vanish identically are returned as the float 0.0)
     """
+    r = _clamp_radius(r)
+    if radial_profiles is None:
+        radial_profiles = _radial_profiles(r, 3, k)
+    Q, X = radial_profiles[:2]
+    inv_r = 1.0/r
 
-    # Computes radial component
-    separator = r <=1.
-    Q = np.empty_like(r)
-    Q[separator] = r[separator]**(-0.5)*jv(7.0/2.0, k*r[separator])
-    Q[~separator] = r[~separator]**(-4.0)*jv(7.0/2.0, k)
+    # Auxiliary (uses cos(2 theta) = 2 cos(theta)^2 - 1)
+    cost = cos(theta)
+    cost2 = cost*cost
 
-    Br = Q*cos(theta)*(5.0*cos(2.*theta)-1.)*C*(2.0/r)
+    # Computes radial component
+    Br = 2.0*C*inv_r*Q*(cost*(10.*cost2-6.))
 
     # Computes polar component
     # X = d(rQ1)/dr
-    # r<=1, first define some auxiliary quantities
-    y = k*r[separator]
-    X = np.empty_like(r)
-
-    X[separator]  = k**(0.5)*y**(0.5)*(jv(2.5,y) - jv(4.5,y))/2.0 \
-                    + 0.5*r[separator]**(-0.5)*jv(3.5,y)
-    X[~separator] = -3*jv(3.5,k)*r[~separator]**(-4)
-
-
-    # Sets Btheta
-    Btheta = C*(-sin(theta)/r)*(5.*(cos(theta))**2-1.)*X
+    Btheta = -C*inv_r*X*(sin(theta)*(5.*cost2-1.))
 
     # Sets azimuthal component
-    Bphi   = np.zeros_like(r)
+    Bphi   = 0.0
 
     return Br, Btheta, Bphi
 
 
-def get_B_a_3(r, theta, phi, C=3.445, k=5.763):
+def get_B_a_3(r, theta, phi, C=3.445, k=5.763,
+              radial_profiles=None):
     r"""
     Computes the third antisymmetric free decay mode - one of a
     degenerate pair, with eigenvalue :math:`\gamma_2=-(5.763)^2`.
@@ -152,32 +317,37 @@ def get_B_a_3(r, theta, phi, C=3.445, k=5.763):
         Mode normalization.
     k : float, optional
         :math:`k`
+    radial_profiles : tuple, optional
+        Precomputed output of :func:`_radial_profiles` (used by
+        :func:`get_all_modes` to share it between modes).
 
     Returns
     -------
     list
         List containing three `numpy` arrays corresponding to:
         :math:`B_r`, :math:`B_\theta`, :math:`B_\phi`
+        (components which vanish identically are returned as the float 0.0)
     """
-    separator = r <=1.
-
     # Sets radial component
-    Br = np.zeros_like(r)
+    Br = 0.0
 
     # Sets polar component
-    Btheta = np.zeros_like(r)
+    Btheta = 0.0
 
     # Computes azimuthal component
-    Q = np.empty_like(r)
-    Q[separator] = r[separator]**(-0.5)*jv(5.0/2.0, k*r[separator])
-    Q[~separator] = r[~separator]**(-3.0)*jv(5.0/2.0, k)
+    # (Q_2 is obtained together with the profiles of the poloidal partner,
+    # get_B_a_2)
+    if radial_profiles is None:
+        radial_profiles = _radial_profiles(r, 3, k)
+    Q = radial_profiles[2]
 
     Bphi = C*Q*sin(theta)*cos(theta)
 
     return Br, Btheta, Bphi
 
 
-def get_B_a_4(r, theta, phi, C=0.244, k=(2.*pi)):
+def get_B_a_4(r, theta, phi, C=0.244, k=(2.*pi),
+              radial_profiles=None):
     r"""
     Computes the forth antisymmetric free decay mode.
     Purely poloidal.
@@ -194,18 +364,24 @@ def get_B_a_4(r, theta, phi, C=0.244, k=(2.*pi)):
         Mode normalization.
     k : float, optional
         :math:`k`
+    radial_profiles : tuple, optional
+        Precomputed output of :func:`_radial_profiles` (used by
+        :func:`get_all_modes` to share it between modes).
 
     Returns
     -------
     list
         List containing three `numpy` arrays corresponding to:
         :math:`B_r`, :math:`B_\theta`, :math:`B_\phi`
+        (components which vanish identically are returned as the float 0.0)
     """
     # This happens to have the same form as the 1st antisymmetric mode
-    return get_B_a_1(r, theta, phi, C=C, k=k)
+    return get_B_a_1(r, theta, phi, C=C, k=k,
+                     radial_profiles=radial_profiles)
 
 
-def get_B_s_1(r, theta, phi, C=0.653646562698, k=4.493409457909):
+def get_B_s_1(r, theta, phi, C=0.653646562698, k=4.493409457909,
+              radial_profiles=None):
     r"""
     Computes the first (poloidal) symmetric free decay mode.
     Purely poloidal.
@@ -222,42 +398,41 @@ def get_B_s_1(r, theta, phi, C=0.653646562698, k=4.493409457909):
         Mode normalization.
     k : float, optional
         :math:`k`
+    radial_profiles : tuple, optional
+        Precomputed output of :func:`_radial_profiles` (used by
+        :func:`get_all_modes` to share it between modes).
 
     Returns
     -------
     list
         List containing three `numpy` arrays corresponding to:
         :math:`B_r`, :math:`B_\theta`, :math:`B_\phi`
+        (components which vanish identically are returned as the float 0.0)
     """
-    separator = r <=1.
+    r = _clamp_radius(r)
+    if radial_profiles is None:
+        radial_profiles = _radial_profiles(r, 2, k)
+    Q, X = radial_profiles[:2]
+    inv_r = 1.0/r
 
-    # Computes radial component
-    Q = np.empty_like(r)
-    Q[separator] = r[separator]**(-0.5)*jv(5.0/2.0,k*r[separator])
-    Q[~separator]  = r[~separator]**(-3.0)*jv(5.0/2.0,k)
+    # Auxiliary
+    cost = cos(theta)
 
-    Br = C*Q*(3.0*cos(theta)**2-1)/r
+    # Computes radial component
+    Br = C*inv_r*Q*(3.0*cost*cost-1)
 
     # Computes theta component
-    X = np.zeros_like(r)
-    y = k*r[separator]
-    siny = sin(y)
-    cosy = cos(y)
-    X[separator] = (3*siny/y**2 - siny - 3.*cosy/y)/sqrt(2*pi*y*r[r<=1]) \
-      - k*sqrt(r[r<=1])*(3.*siny/y**2-siny-3.*cosy/y)/sqrt(2*pi)*y**(-3./2.)\
-      + sqrt(2./pi*r[r<=1])*(-6.*siny*k/y**3+6.*cosy*k/y**2+3*siny*k/y-k*cosy)/(
-                                                                        sqrt(y))
-    X[~separator] = -2.0*r[~separator]**(-3.0)*jv(5.0/2.0,k)
-
-    Btheta = C*(-sin(theta)*cos(theta)/r)*X
+    # X = d(rQ)/dr
+    Btheta = -C*inv_r*X*(sin(theta)*cost)
 
     # Sets azimuthal component
-    Bphi   = np.zeros_like(r)
+    Bphi   = 0.0
 
     return Br, Btheta, Bphi
 
 
-def get_B_s_2(r, theta, phi, C=1.32984358196, k=4.493409457909):
+def get_B_s_2(r, theta, phi, C=1.32984358196, k=4.493409457909,
+              radial_profiles=None):
     r"""
     Computes the second symmetric free decay mode (one of a
     degenerate pair, with eigenvalue gamma_2=-(5.763)^2 .
@@ -275,31 +450,36 @@ def get_B_s_2(r, theta, phi, C=1.32984358196, k=4.493409457909):
         Mode normalization.
     k : float, optional
         :math:`k`
+    radial_profiles : tuple, optional
+        Precomputed output of :func:`_radial_profiles` (used by
+        :func:`get_all_modes` to share it between modes).
 
     Returns
     -------
     list
         List containing three `numpy` arrays corresponding to:
         :math:`B_r`, :math:`B_\theta`, :math:`B_\phi`
+        (components which vanish identically are returned as the float 0.0)
     """
-    separator = r <=1.
-
     # Sets radial component
-    Br = np.zeros_like(r)
+    Br = 0.0
 
     # Sets theta component
-    Btheta = np.zeros_like(r)
+    Btheta = 0.0
 
     # Computes azimuthal component
-    Q = np.empty_like(r)
-    Q[separator] = r[separator]**(-0.5)*jv(3.0/2.0, k*r[separator])
-    Q[~separator] = r[~separator]**(-2.0)*jv(3.0/2.0, k)
+    # (Q_1 is obtained together with the profiles of the poloidal partner,
+    # get_B_s_1)
+    if radial_profiles is None:
+        radial_profiles = _radial_profiles(r, 2, k)
+    Q = radial_profiles[2]
 
     Bphi = C*Q*sin(theta)
 
     return Br, Btheta, Bphi
 
-def get_B_s_3(r, theta, phi, C=0.0169610298034, k=6.987932000501):
+def get_B_s_3(r, theta, phi, C=0.0169610298034, k=6.987932000501,
+              radial_profiles=None):
     r"""
     Computes the third symmetric free decay mode.
     Purely poloidal
@@ -316,43 +496,47 @@ def get_B_s_3(r, theta, phi, C=0.0169610298034, k=6.987932000501):
         Mode normalization.
     k : float, optional
         :math:`k`
+    radial_profiles : tuple, optional
+        Precomputed output of :func:`_radial_profiles` (used by
+        :func:`get_all_modes` to share it between modes).
 
     Returns
     -------
     list
         List containing three `numpy` arrays corresponding to:
         :math:`B_r`, :math:`B_\theta`, :math:`B_\phi`
+        (components which vanish identically are returned as the float 0.0)
     """
-    separator = r <=1.
-
     # Auxiliary
     cost = cos(theta)
     sint = sin(theta)
-    y = k*r[separator]
+    cost2 = cost*cost
+
+    r = _clamp_radius(r)
+    if radial_profiles is None:
+        radial_profiles = _radial_profiles(r, 4, k)
+    Q, X = radial_profiles[:2]
+    inv_r = 1.0/r
 
     # Computes radial component
-    Q = np.empty_like(r)
-    Q[separator] = r[separator]**(-0.5)*jv(9.0/2.0,y)
-    Q[~separator]  = r[~separator]**(-5.0)*jv(9.0/2.0,k)
-    S = -700.*cost**4+600.*cost**2-60
+    S = -60. + cost2*(600. - 700.*cost2)
 
-    Br = C*Q*S/r
+    Br = C*inv_r*Q*S
 
     # Computes theta component
-    Q[separator] = Q[separator]/2.0 + r[separator]**(0.5)/2.0 * k  \
-                                        * (jv(7.0/2.0,y) - jv(11.0/2.0,y))
-    Q[~separator] = -4*r[~separator]**(-5.0)*jv(9.0/2.0,k)
-    S = -140.0*cost**3*sint+60*cost*sint
+    # X = d(rQ)/dr
+    S = sint*cost*(60. - 140.*cost2)
 
-    Btheta = -C * Q * S/r
+    Btheta = -C*inv_r*X*S
 
     # Sets azimuthal component
-    Bphi = np.zeros_like(r)
+    Bphi = 0.0
 
     return Br, Btheta, Bphi
 
 
-def get_B_s_4(r, theta, phi, C=0.539789362061, k=6.987932000501):
+def get_B_s_4(r, theta, phi, C=0.539789362061, k=6.987932000501,
+              radial_profiles=None):
     r"""
     Computes the fourth symmetric free decay mode.
     Purely toroidal.
@@ -369,26 +553,31 @@ def get_B_s_4(r, theta, phi, C=0.539789362061, k=6.987932000501):
         Mode normalization.
     k : float, optional
         :math:`k`
+    radial_profiles : tuple, optional
+        Precomputed output of :func:`_radial_profiles` (used by
+        :func:`get_all_modes` to share it between modes).
 
     Returns
     -------
     list
         List containing three `numpy` arrays corresponding to:
         :math:`B_r`, :math:`B_\theta`, :math:`B_\phi`
+        (components which vanish identically are returned as the float 0.0)
     """
-    separator = r <=1.
-
     # Sets radial component
-    Br = np.zeros_like(r)
+    Br = 0.0
 
     # Sets theta component
-    Btheta = np.zeros_like(r)
+    Btheta = 0.0
 
     # Computes azimuthal component
-    Q = np.empty_like(r)
-    Q[separator] = r[separator]**(-0.5)*jv(7.0/2.0, k*r[separator])
-    Q[~separator] = r[~separator]**(-4.0)*jv(7.0/2.0, k)
-    S = 3.*sin(theta)*(1.-5.*(cos(theta))**2)
+    # (Q_3 is obtained together with the profiles of the poloidal partner,
+    # get_B_s_3)
+    if radial_profiles is None:
+        radial_profiles = _radial_profiles(r, 4, k)
+    Q = radial_profiles[2]
+    cost = cos(theta)
+    S = 3.*sin(theta)*(1.-5.*cost*cost)
 
     Bphi = -C*Q*S
 
@@ -409,6 +598,21 @@ antisymmetric_modes_list = [get_B_a_1, get_B_a_2, get_B_a_3, get_B_a_4]
 mixed_modes_list = [get_B_a_1, get_B_s_2, get_B_s_1, get_B_a_3,
                     get_B_a_2, get_B_s_4, get_B_s_3, get_B_a_4]
 
+# Arguments (n, k) of the _radial_profiles call used by each mode.
+# The two modes of each degenerate pair share the same radial profiles.
+_radial_profiles_arguments = {get_B_a_1: (1, pi),
+                              get_B_a_2: (3, 5.763),
+                              get_B_a_3: (3, 5.763),
+                              get_B_a_4: (1, 2.*pi),
+                              get_B_s_1: (2, 4.493409457909),
+                              get_B_s_2: (2, 4.493409457909),
+                              get_B_s_3: (4, 6.987932000501),
+                              get_B_s_4: (4, 6.987932000501)}
+
+# Boundary values, J_{n-1/2}(k) and J_{n+1/2}(k), keyed by (n, k)
+_BOUNDARY = {arguments: _boundary_values(*arguments)
+             for arguments in set(_radial_profiles_arguments.values())}
+
 def get_mode(r, theta, phi, n_mode, symmetric):
     r"""
     Computes the n_mode'th free decay mode.
@@ -436,6 +640,12 @@ def get_mode(r, theta, phi, n_mode, symmetric):
     At the moment, only the first 4 symmetric and first 4 antisymmetric modes
     are available. Later versions will support arbitrary choice of mode.
 
+    The modes are axisymmetric and `r` and `theta` only need to be
+    broadcastable against each other. If the coordinates are separable
+    (e.g. `r` with shape (N,1,1) and `theta` with shape (1,N,1)) the radial
+    and angular parts are computed on O(N) points only and the result is
+    broadcast to the full shape.
+
     Returns
     -------
     list
@@ -446,11 +656,67 @@ def get_mode(r, theta, phi, n_mode, symmetric):
         raise NotImplementedError
 
     if symmetric == True:
-        return symmetric_modes_list[n_mode-1](r, theta, phi)
+        B = symmetric_modes_list[n_mode-1](r, theta, phi)
     elif symmetric == False:
-        return antisymmetric_modes_list[n_mode-1](r, theta, phi)
+        B = antisymmetric_modes_list[n_mode-1](r, theta, phi)
     else:
-        return mixed_modes_list[n_mode-1](r, theta, phi)
+        B = mixed_modes_list[n_mode-1](r, theta, phi)
+
+    return _as_arrays(B, r, theta)
+
+def get_all_modes(r, theta, phi, n_modes, symmetric):
+    r"""
+    Computes the first n_modes free decay modes.
+
+    Equivalent to calling :func:`get_mode` for each mode, but the radial
+    profiles (the expensive part of the calculation) are computed only once
+    for each pair of modes sharing the same :math:`k`.
+
+    Parameters
+    ----------
+    r : array_like
+        NxNxN array containing azimuthal coordinates.
+    theta : array_like
+        NxNxN array containing azimuthal coordinates.
+    phi : array_like
+        NxNxN array containing azimuthal coordinates.
+    n_modes : int
+        number of modes to be computed
+    symmetric :
+        If `True`, the modes are assumed to be symmetric over the midplane
+        (i.e. quadrupolar). If `False` the modes are assumed to be
+        antisymmetric (dipolar). If `None` (or anything else), than the modes
+        are drawn from a mixture of symmetric and antisymmetric modes.
+
+    Returns
+    -------
+    numpy.ndarray
+        Array with shape (n_modes, 3, ...) where the second axis corresponds
+        to the components :math:`B_r`, :math:`B_\theta`, :math:`B_\phi` and
+        the remaining axes to the (broadcast) shape of `r` and `theta`.
+    """
+    if (n_modes>4 and symmetric in (True, False)) or (n_modes>8):
+        raise NotImplementedError
+
+    if symmetric == True:
+        modes_list = symmetric_modes_list
+    elif symmetric == False:
+        modes_list = antisymmetric_modes_list
+    else:
+        modes_list = mixed_modes_list
+
+    modes = np.empty((n_modes, 3) + np.broadcast(r, theta).shape,
+                     dtype=np.result_type(r, theta))
+    profiles = {}
+    for i, get_B_mode in enumerate(modes_list[:n_modes]):
+        arguments = _radial_profiles_arguments[get_B_mode]
+        if arguments not in profiles:
+            profiles[arguments] = _radial_profiles(r, *arguments)
+        B = get_B_mode(r, theta, phi, radial_profiles=profiles[arguments])
+        # Vanishing components are scalars, which are simply broadcast
+        for j in range(3):
+            modes[i,j] = B[j]
+    return modes
 
 class xi_lookup_table(object):
     r"""
@@ -561,8 +827,12 @@ class xi_lookup_table(object):
         numpy.ndarray
             A (max_n,max_l)-array containing containing the roots of
         """
+        # mpmath is only needed here, and is imported locally to keep
+        # the import of this module light
+        from mpmath import besselj, findroot
+
         self.table = np.empty((max_n,max_l))
-        guesses = linspace(3,max_guess,number_of_guesses)
+        guesses = np.linspace(3,max_guess,number_of_guesses)
 
         for n in range(1,max_n+1):
             # The following should be zero in order to have a free decay mode
@@ -572,7 +842,7 @@ class xi_lookup_table(object):
                 try:
 
                     # Stores every root found
-                    results.append(float(findroot(f, guess)))
+                    results.append(float(findroot(f, guess).real))
                 except ValueError:
                     # Ignores failures in finding the root
                     pass
@@ -161,8 +161,7 @@ def simple_V_linear(rho, theta, phi, r_h=1.0, Vh=220, fraction=3./15.,
     Vr, Vt, Vp = simple_V(rho, theta, phi, r_h, Vh, fraction, normalize)
 
     z = np.abs(rho/r_h * np.cos(theta)) # Dimensionless z
-    decay_factor = (1-z/fraction_z)
-    Vp[decay_factor<0.] = 0.
+    decay_factor = np.maximum(1-z/fraction_z, 0.)
 
     return Vr, Vt, Vp*decay_factor
 
@@ -185,8 +184,7 @@ def simple_alpha(rho, theta, phi, alpha0=1.0):
     alpha0 : float, optional
         Normalization. Default: 1.0
     """
-    alpha = np.cos(theta)
-    alpha[rho>1.] = 0.
+    alpha = np.where(rho>1., 0., np.cos(theta))
 
     return alpha*alpha0
 
@@ -0,0 +1,93 @@
+#! /usb/bin/env python
+r""" Script that tests the disk field constructed from reversal constraints
+     The reference values were computed with the original (per mode and
+     per constraint) implementation of B_generator_disk.
+ """
+import numpy as np
+from galmag.B_generators.B_generator_disk import B_generator_disk
+
+# Reference values for each set of constraints: the modes normalization,
+# B_r and B_phi at the midplane and B_z at z=-0.5 (at r = 1, 4, 7, 10, 13)
+_reference = {
+    # Square system: as many modes as constraints
+    'square': (dict(reversals=[7.0]),
+               [4.597011639206, -1.588234669941],
+               [-7.120207715260e-01, -7.649401952559e-01, 0.,
+                3.605055070955e-01, 3.187013125367e-01],
+               [1.537580770363, 3.389899085724, 0.,
+                -5.639048192336, -7.062544790424],
+               [-4.68739821e-04, -8.58719197e-04, 1.326559342e-02,
+                3.4161408398e-02, -2.819583591e-03]),
+    # Under-determined system: more modes than constraints
+    'underdetermined': (dict(reversals=[7.0], number_of_modes=4),
+               [1.615790395207, -0.209385181169, -2.18356456688,
+                0.581192811653],
+               [5.294502744684e-02, -3.394028827446e-01, 0.,
+                2.956204090028e-01, 1.145097454160e-02],
+               [-1.143326983483e-01, 1.504093429844, 0.,
+                -4.624111699251, -2.537580405626e-01],
+               [1.463245442820e-05, -1.441793968377e-03, 1.288711248113e-02,
+                1.038377119332e-02, -3.596268397045e-02]),
+    # Singular system: the repeated reversal leaves a free mode
+    'singular': (dict(reversals=[7.0, 7.0]),
+               [1.560573444374, -0.867780267456, -2.315983792347],
+               [-1.408074491546, -1.327056081256, 0.,
+                2.624716090471e-01, 8.476710267708e-02],
+               [3.040681322820, 5.880964583186, 0.,
+                -4.105596234746, -1.878471897860],
+               [-9.18801551e-04, -8.9793056e-04, 1.6874418983e-02,
+                8.005327086e-03, -1.6019353872e-02]),
+    }
+
+def _disk_generator(dtype=float):
+    return B_generator_disk(box=[[1.,13.],[0.,0.],[-0.5,0.5]],
+                            resolution=[5,1,3], grid_type='cylindrical',
+                            dtype=dtype)
+
+
+class TestDisk():
+    def test_square(self):
+        self.__check_reference('square')
+
+    def test_underdetermined(self):
+        self.__check_reference('underdetermined')
+
+    def test_singular(self):
+        self.__check_reference('singular')
+
+    def test_float32(self):
+        B_generator_32, B_generator_64 = _disk_generator(np.float32), \
+                                         _disk_generator()
+        for kwargs in (dict(reversals=[7.0]), dict(reversals=[5.0, 12.0]),
+                       dict(reversals=[7.0], number_of_modes=4)):
+            B32 = B_generator_32.find_B_field(**kwargs)
+            B64 = B_generator_64.find_B_field(**kwargs)
+            # The normalization is always computed in double precision
+            assert np.allclose(B32.parameters['disk_modes_normalization'],
+                               B64.parameters['disk_modes_normalization'],
+                               rtol=1e-12, atol=0.)
+            for component in ('r_cylindrical', 'phi', 'z'):
+                B_32, B_64 = getattr(B32, component), getattr(B64, component)
+                assert B_32.dtype == np.float32
+                assert np.allclose(B_32, B_64, rtol=1e-5,
+                                   atol=1e-5*np.abs(B_64).max())
+
+    def __check_reference(self, case):
+        kwargs, Cn, Br, Bphi, Bz = _reference[case]
+        B = _disk_generator().find_B_field(**kwargs)
+
+        assert np.allclose(B.parameters['disk_modes_normalization'], Cn,
+                           rtol=1e-10, atol=0.)
+        assert np.allclose(B.r_cylindrical[:,0,1], Br, rtol=1e-10,
+                           atol=1e-12)
+        assert np.allclose(B.phi[:,0,1], Bphi, rtol=1e-10, atol=1e-12)
+        assert np.allclose(B.z[:,0,0], Bz, rtol=1e-8, atol=1e-12)
+        # The field vanishes at the reversal
+        assert np.isclose(B.phi[2,0,1], 0., atol=1e-12)
+
+
+if __name__ == "__main__":
+    test_disk = TestDisk()
+    for test in dir(test_disk):
+        if 'test' in test:
+            getattr(test_disk, test)()
@@ -42,6 +42,49 @@ class TestHaloFreeDecayModes():
     def test_a4(self):
         self.__check_nmode(4, False)
 
+    def test_separable_coordinates(self):
+        grid = Grid([[0.01,1.5], # r range
+                    [0.01,np.pi],  # theta range
+                    [0.,0.]], # phi range
+                    resolution=[31,21,1],
+                    grid_type='spherical')
+        rr, tt, pp = grid.r_spherical, grid.theta, grid.phi
+
+        for symmetric in (True, False):
+            for n_mode in range(1,5):
+                B = free.get_mode(rr, tt, pp, n_mode, symmetric)
+                B_sep = free.get_mode(rr[:,:1,:], tt[:1,:,:], pp,
+                                      n_mode, symmetric)
+                for Bi, Bi_sep in zip(B, B_sep):
+                    assert Bi_sep.shape == Bi.shape
+                    assert np.allclose(Bi_sep, Bi)
+
+    def test_all_modes(self):
+        grid = Grid([[0.01,1.5], # r range
+                    [0.01,np.pi],  # theta range
+                    [0.,0.]], # phi range
+                    resolution=[31,21,1],
+                    grid_type='spherical')
+        rr, tt, pp = grid.r_spherical, grid.theta, grid.phi
+
+        for symmetric, n_modes in ((True, 4), (False, 4), (None, 8)):
+            modes = free.get_all_modes(rr, tt, pp, n_modes, symmetric)
+            for n_mode in range(1,n_modes+1):
+                B = free.get_mode(rr, tt, pp, n_mode, symmetric)
+                for Bi, Bi_all in zip(B, modes[n_mode-1]):
+                    assert np.allclose(Bi_all, Bi)
+
+    def test_origin(self):
+        theta = np.linspace(0.01, np.pi, 11)[np.newaxis,:]
+        for symmetric in (True, False):
+            for n_mode in range(1,5):
+                B0 = free.get_mode(np.zeros((1,1)), theta, 0., n_mode, symmetric)
+                B = free.get_mode(np.full((1,1), 1e-7), theta, 0., n_mode,
+                                  symmetric)
+                for Bi0, Bi in zip(B0, B):
+                    assert np.all(np.isfinite(Bi0))
+                    assert np.allclose(Bi0, Bi, atol=1e-6)
+
     def __check_nmode(self, n_mode, symmetric):
         Nop=21
         No = 201
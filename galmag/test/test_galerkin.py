@@ -0,0 +1,101 @@
+#! /usb/bin/env python
+r""" Script that tests the Galerkin expansion of the halo dynamo solution
+ """
+import numpy as np
+from galmag.B_generators.B_generator_halo import B_generator_halo
+from galmag.galerkin import (Galerkin_expansion_coefficients,
+                             perturbation_operator)
+from galmag.halo_profiles import simple_V, simple_alpha
+from galmag import halo_free_decay_modes as free
+from galmag.Grid import Grid
+
+def _halo_parameters(**kwargs):
+    generator = B_generator_halo(box=[[-1.,1.]]*3, resolution=[3,3,3])
+    parameters = generator._builtin_parameter_defaults.copy()
+    parameters['halo_Galerkin_ngrid'] = 101
+    parameters.update(kwargs)
+    return parameters
+
+
+class TestGalerkin():
+    def test_one_quadrant(self):
+        # ngrid=203 leads to an even number of points in the northern
+        # hemisphere if it is simply halved
+        for ngrid in (201, 203):
+            for symmetric in (True, False):
+                for dynamo_type in ('alpha-omega', 'alpha2-omega'):
+                    (val_half, Wij_half), (val_full, Wij_full) = \
+                        self.__compare_quadrant(
+                            halo_Galerkin_ngrid=ngrid,
+                            halo_symmetric_field=symmetric,
+                            halo_dynamo_type=dynamo_type)
+                    # The two grids only agree within the discretisation
+                    # error (which is much smaller than the growth rates)
+                    assert np.allclose(np.sort_complex(val_half),
+                                       np.sort_complex(val_full), rtol=0.,
+                                       atol=1e-6*np.abs(val_full).max())
+                    assert np.allclose(Wij_half, Wij_full, rtol=0.,
+                                       atol=1e-6*np.abs(Wij_full).max())
+
+    def test_one_quadrant_without_parity(self):
+        # An alpha profile which is even with respect to the midplane
+        # does not allow folding the integral: the whole sphere is used
+        def even_alpha(r, theta, phi):
+            return np.ones_like(r*theta)
+
+        for symmetric in (True, False):
+            (val_half, Wij_half), (val_full, Wij_full) = \
+                self.__compare_quadrant(halo_symmetric_field=symmetric,
+                                        halo_alpha_function=even_alpha)
+            assert np.array_equal(val_half, val_full)
+            assert np.array_equal(Wij_half, Wij_full)
+
+    def test_alpha_omega_operator(self):
+        grid = Grid([[0.01,1.0], # r range
+                    [0.01,np.pi],  # theta range
+                    [0.,0.]], # phi range
+                    resolution=[51,41,1],
+                    grid_type='spherical')
+        rr, tt, pp = grid.r_spherical, grid.theta, grid.phi
+        V = simple_V(rr, tt, pp)
+        alpha = simple_alpha(rr, tt, pp)
+        Ra, Ro = 4.331, 203.65472
+
+        has_alpha_term = False
+        for symmetric in (True, False):
+            for n_mode in range(1,4):
+                B = free.get_mode(rr, tt, pp, n_mode, symmetric)
+                B = np.broadcast_arrays(rr, *B)[1:]
+
+                WB_ao, WB_a2o, WB_omega = [
+                    perturbation_operator(rr, tt, pp, B[0], B[1], B[2],
+                                          V[0], V[1], V[2], alpha, Ra_, Ro,
+                                          dynamo_type=dynamo_type)
+                    for Ra_, dynamo_type in ((Ra, 'alpha-omega'),
+                                             (Ra, 'alpha2-omega'),
+                                             (0., 'alpha2-omega'))]
+
+                # The alpha effect is present in the meridional components
+                assert np.allclose(WB_ao[:2], WB_a2o[:2])
+                # but the azimuthal one contains only the Omega effect
+                assert np.allclose(WB_ao[2], WB_omega[2])
+                has_alpha_term |= not np.allclose(WB_ao[2], WB_a2o[2])
+        # Makes sure the alpha effect was actually removed from some mode
+        assert has_alpha_term
+
+    def __compare_quadrant(self, **kwargs):
+        results = []
+        for one_quadrant in (True, False):
+            parameters = _halo_parameters(
+                halo_compute_only_one_quadrant=one_quadrant, **kwargs)
+            val, vec, Wij = Galerkin_expansion_coefficients(parameters,
+                                                            return_matrix=True)
+            results.append((val, Wij))
+        return results
+
+
+if __name__ == "__main__":
+    test_galerkin = TestGalerkin()
+    for test in dir(test_galerkin):
+        if 'test' in test:
+            getattr(test_galerkin, test)()
@@ -0,0 +1,38 @@
+#! /usb/bin/env python
+r""" Script that tests the numerical tools in galmag.util
+ """
+import numpy as np
+from galmag.util import derive, simpson_weights
+
+class TestUtil():
+    def test_simpson_weights(self):
+        # Both Simpson's rules are exact for cubic polynomials, thus
+        # any number of points (odd or even) should give the exact result
+        for n in range(2, 12):
+            x = np.linspace(0.5, 2.0, n)
+            if n == 2:
+                f, exact = 3.0*x - 1.0, 3.0*(2.0**2-0.5**2)/2. - 1.5
+            else:
+                f, exact = x**3 - 2.0*x, (2.0**4-0.5**4)/4. - (2.0**2-0.5**2)
+            assert np.isclose((f*simpson_weights(x)).sum(), exact)
+
+    def test_derive_edges(self):
+        # The 4th order finite differences (including the one-sided ones,
+        # used at the edges) are exact for 4th order polynomials
+        x = np.linspace(-1.0, 2.0, 11)
+        f = x**4 - 3.0*x**3 + x
+        dfdx = 4.0*x**3 - 9.0*x**2 + 1.0
+        for axis in range(3):
+            shape = [1, 1, 1]
+            shape[axis] = x.size
+            V = np.broadcast_to(f.reshape(shape), (x.size,)*3).copy()
+            dVdx = derive(V, x[1]-x[0], axis=axis, order=4)
+            expected = np.broadcast_to(dfdx.reshape(shape), V.shape)
+            assert np.allclose(dVdx, expected)
+
+
+if __name__ == "__main__":
+    test_util = TestUtil()
+    for test in dir(test_util):
+        if 'test' in test:
+            getattr(test_util, test)()
@@ -84,7 +84,7 @@ def _derive_0_4(V, dx):
     a0 = -25./12.; a1=4.0; a2=-3.0; a3=4./3.; a4=-1./4.
     dVdx[0:2,:,:] = ( V[0:2,:,:]*a0 + V[1:3,:,:]*a1
                     + V[2:4,:,:]*a2 + V[3:5,:,:]*a3
-                    + V[3:5,:,:]*a4 )/dx
+                    + V[4:6,:,:]*a4 )/dx
 
     dVdx[-2:,:,:] = - ( V[-2:,:,:]*a0 + V[-3:-1,:,:]*a1
                       + V[-4:-2,:,:]*a2 + V[-5:-3,:,:]*a3
@@ -108,7 +108,7 @@ def _derive_1_4(V, dx):
     a0 = -25./12.; a1=4.0; a2=-3.0; a3=4./3.; a4=-1./4.
     dVdx[:,0:2,:] = ( V[:,0:2,:]*a0 + V[:,1:3,:]*a1
                     + V[:,2:4,:]*a2 + V[:,3:5,:]*a3
-                    + V[:,3:5,:]*a4 )/dx
+                    + V[:,4:6,:]*a4 )/dx
 
     dVdx[:,-2:,:] = - ( V[:,-2:,:]*a0 + V[:,-3:-1,:]*a1
                       + V[:,-4:-2,:]*a2 + V[:,-5:-3,:]*a3
@@ -132,7 +132,7 @@ def _derive_2_4(V, dx):
     a0 = -25./12.; a1=4.0; a2=-3.0; a3=4./3.; a4=-1./4.
     dVdx[:,:,0:2] = ( V[:,:,0:2]*a0 + V[:,:,1:3]*a1
                     + V[:,:,2:4]*a2 + V[:,:,3:5]*a3
-                    + V[:,:,3:5]*a4 )/dx
+                    + V[:,:,4:6]*a4 )/dx
 
     dVdx[:,:,-2:] = - ( V[:,:,-2:]*a0 + V[:,:,-3:-1]*a1
                       + V[:,:,-4:-2]*a2 + V[:,:,-5:-3]*a3
@@ -178,12 +178,6 @@ def curl_spherical(rr, tt, pp, Br, Bt, Bp, order=4):
             raise ValueError('Invalid spacing for dphi')
 
     # Computes partial derivatives
-    dBr_dr = derive(Br, dr, order=order)
-    dBr_dtheta = derive(Br, dtheta, axis=1, order=order)
-
-    dBtheta_dr = derive(Bt, dr, order=order)
-    dBtheta_dtheta = derive(Bt, dtheta, axis=1, order=order)
-
     dBphi_dr = derive(Bp, dr, axis=0, order=order)
     dBphi_dtheta = derive(Bp, dtheta, axis=1, order=order)
 
@@ -205,11 +199,40 @@ def curl_spherical(rr, tt, pp, Br, Bt, Bp, order=4):
     if not axisymmetry:
       cBtheta += dBr_dphi/sint/rr
 
-    cBphi = Bt/rr + dBtheta_dr - dBr_dtheta/rr
+    cBphi = curl_phi_spherical(rr, tt, Br, Bt, order=order)
 
     return cBr, cBtheta, cBphi
 
 
+def curl_phi_spherical(rr, tt, Br, Bt, order=4):
+    r"""
+    Computes the azimuthal component of the curl of a vector in spherical
+    coordinates (see :func:`curl_spherical`), which does not depend on
+    :math:`B_\phi`.
+
+    Parameters
+    ----------
+    rr/tt : array_like
+        NxNxN arrays containing the :math:`r` and :math:`\theta` coordinates
+    Br/Bt : array_like
+        NxNxN arrays :math:`r` and :math:`\theta` components of the vector
+        in the same coordinate grid.
+
+    Returns
+    -------
+    numpy.ndarray
+        NxNxN array containing the :math:`\phi` component of the curl.
+    """
+    # Gets grid spacing (assuming uniform grid spacing)
+    dr = rr[1,0,0]-rr[0,0,0]
+    dtheta  = tt[0,1,0] - tt[0,0,0]
+
+    dBtheta_dr = derive(Bt, dr, order=order)
+    dBr_dtheta = derive(Br, dtheta, axis=1, order=order)
+
+    return Bt/rr + dBtheta_dr - dBr_dtheta/rr
+
+
 #@jit
 def simpson(f, r):
     """Integrates over the last axis"""
@@ -224,6 +247,35 @@ def simpson(f, r):
     else:
         raise NotImplementedError
 
+def simpson_weights(r):
+    """
+    Weights of the composite Simpson quadrature over a 1D uniform grid r.
+
+    For an odd number of points these are the weights used by
+    :func:`simpson`, i.e. `simpson(f, r) == (f*simpson_weights(r)).sum()`.
+    For an even number of points, Simpson's 3/8 rule is used for the last
+    three intervals (and the trapezoidal rule, if there are only two points).
+    """
+    n = len(r)
+    if n < 2:
+        raise ValueError('At least two points are needed for the quadrature')
+    h = r[1]-r[0]
+    if n == 2:
+        return np.full_like(r, h/2.0)
+
+    # Number of points integrated with the (1/3) Simpson rule
+    n_13 = n if n % 2 else n-3
+
+    w = np.zeros_like(r)
+    if n_13 > 1:
+        w[:n_13] = 1.0
+        w[1:n_13-1] += 1.0
+        w[1:n_13-1:2] += 2.0
+        w[:n_13] *= h/3.0
+    if n_13 < n:
+        w[-4:] += np.array([1.0, 3.0, 3.0, 1.0])*(3.0*h/8.0)
+    return w
+
 @njit(parallel=True)
 def simpson_1(f,r):
     integ = f.copy()